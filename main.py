@@ -6,6 +6,7 @@ Main application launcher for Clean Architecture implementation with MCP integra
 
 import os
 import sys
+import asyncio
 import subprocess
 import argparse
 from typing import Optional
@@ -74,6 +75,34 @@ def run_fastapi_client():
         print(f"❌ FastAPI Client error: {e}")
 
 
+async def _stop_process(process: asyncio.subprocess.Process):
+    """Terminate a child process, killing it if it doesn't exit in time"""
+    if process.returncode is not None:
+        return
+    
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=5)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+
+async def _supervise(*scripts: str):
+    """Run scripts as child processes and wait for all of them without blocking"""
+    processes = []
+    try:
+        for script in scripts:
+            processes.append(await asyncio.create_subprocess_exec(sys.executable, script))
+        
+        await asyncio.gather(*(process.wait() for process in processes))
+    finally:
+        # Reached on Ctrl+C (task cancellation) or if a launch failed
+        if any(process.returncode is None for process in processes):
+            print("\n🛑 Stopping servers...")
+        await asyncio.gather(*(_stop_process(process) for process in processes))
+
+
 def run_both():
     """Run both MCP server and FastAPI client"""
     print("🚀 Starting both Clean Architecture servers...")
@@ -83,35 +112,17 @@ def run_both():
     print("")
     
     try:
-        # Start MCP server in background
-        mcp_process = subprocess.Popen([
-            sys.executable, 
-            "src/infrastructure/web/mcp_server.py"
-        ])
-        
-        # Start FastAPI client (blocking)
-        fastapi_process = subprocess.Popen([
-            sys.executable, 
+        asyncio.run(_supervise(
+            "src/infrastructure/web/mcp_server.py",
             "src/infrastructure/web/fastapi_app.py"
-        ])
-        
-        # Wait for both processes
-        try:
-            mcp_process.wait()
-            fastapi_process.wait()
-        except KeyboardInterrupt:
-            print("\n🛑 Stopping servers...")
-            mcp_process.terminate()
-            fastapi_process.terminate()
-            
-            # Wait for graceful shutdown
-            mcp_process.wait(timeout=5)
-            fastapi_process.wait(timeout=5)
-            
-        print("👋 All servers stopped")
-        
+        ))
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
         print(f"❌ Error running servers: {e}")
+        return
+    
+    print("👋 All servers stopped")
 
 
 def show_architecture_info():
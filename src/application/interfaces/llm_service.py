@@ -4,7 +4,7 @@ Interface for LLM integration following dependency inversion principle.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 from ...domain.entities import Order, Pizza
 
@@ -45,4 +45,20 @@ class ILLMService(ABC):
     @abstractmethod
     async def generate_error_message(self, error: str, context: Dict[str, Any] = None) -> str:
         """Generate user-friendly error message"""
-        pass 
\ No newline at end of file
+        pass
+    
+    async def stream_order_confirmation_message(self, order: Order) -> AsyncIterator[str]:
+        """Stream the order confirmation message in chunks as it is generated
+        
+        The default yields the complete message once; implementations that can
+        stream from the provider override it to yield tokens as they arrive.
+        """
+        yield await self.generate_order_confirmation_message(order)
+    
+    async def stream_welcome_message(self, user_name: Optional[str] = None,
+                                     is_new_user: bool = False) -> AsyncIterator[str]:
+        """Stream the welcome message in chunks as it is generated"""
+        yield await self.generate_welcome_message(user_name, is_new_user)
+    
+    async def aclose(self) -> None:
+        """Release connections held by the service; the default holds none"""
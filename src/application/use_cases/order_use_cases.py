@@ -3,15 +3,22 @@ Application Use Cases - Order Management
 Application-specific business rules and use cases that orchestrate domain entities and services.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 from dataclasses import dataclass
 
 from ..interfaces import ILLMService
-from ...domain.entities import Order, OrderStatus, Pizza
+from ...domain.entities import Order, OrderStatus, Pizza, PizzaSize
 from ...domain.repositories import IOrderRepository, IPizzaRepository, IUserRepository
 from ...domain.services.order_service import OrderDomainService
 
 
+# Menu categories whose results are memoized between menu mutations
+_CACHEABLE_MENU_CATEGORIES = frozenset({"all", "veg", "non-veg"})
+
+# Receives human-readable progress updates while an order is being placed
+ProgressCallback = Callable[[str], Awaitable[None]]
+
+
 @dataclass
 class OrderRequest:
     """Request model for creating orders"""
@@ -45,15 +52,24 @@ class OrderUseCases:
         self._user_repo = user_repo
         self._llm_service = llm_service
         self._order_service = OrderDomainService(order_repo, pizza_repo, user_repo)
+        # category -> (menu revision, menu result)
+        self._menu_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
     
-    async def place_order(self, request: OrderRequest) -> OrderResponse:
-        """Place a new pizza order"""
+    async def place_order(self, request: OrderRequest,
+                          on_progress: Optional[ProgressCallback] = None) -> OrderResponse:
+        """Place a new pizza order, reporting each stage to ``on_progress`` if given"""
         try:
+            if on_progress:
+                await on_progress("Checking the pizzas in your order")
+            
             # Convert item names to pizza items
             pizza_items = []
             for item_name in request.items:
-                # Try to find pizza by name
-                pizzas = await self._pizza_repo.search_by_name(item_name)
+                # Exact name lookup first, then searching by name; legacy aliases only
+                # resolve names nothing else matched, so they never override a search hit
+                pizzas = (await self._pizza_repo.get_by_name(item_name)
+                          or await self._pizza_repo.search_by_name(item_name)
+                          or await self._pizza_repo.get_by_alias(item_name))
                 if not pizzas:
                     return OrderResponse(
                         success=False,
@@ -66,6 +82,9 @@ class OrderUseCases:
                     'quantity': 1
                 })
             
+            if on_progress:
+                await on_progress("Creating your order")
+            
             # Create order using domain service
             order = await self._order_service.create_order_from_items(
                 customer_email=request.customer_email,
@@ -83,6 +102,9 @@ class OrderUseCases:
             # Save updated order
             await self._order_repo.save(order)
             
+            if on_progress:
+                await on_progress("Order confirmed, preparing your confirmation")
+            
             # Generate success message using LLM
             message = await self._llm_service.generate_order_confirmation_message(order)
             
@@ -148,28 +170,33 @@ class OrderUseCases:
     async def find_pizza(self, name: str, size: str = "large") -> Dict[str, Any]:
         """Find pizza by name and size"""
         try:
-            # Search for pizzas by name
-            pizzas = await self._pizza_repo.search_by_name(name)
+            # Exact name lookup first, so "chicken supreme" doesn't resolve to another chicken pizza
+            pizzas = await self._pizza_repo.get_by_name(name)
+            
+            if not pizzas:
+                # Search for pizzas by name
+                pizzas = await self._pizza_repo.search_by_name(name)
             
             if not pizzas:
                 # Try ingredient search as fallback
                 pizzas = await self._pizza_repo.search_by_ingredients(name)
             
+            if not pizzas:
+                # Legacy aliases ("fungi", "carnivore") last, so they never override a search hit
+                pizzas = await self._pizza_repo.get_by_alias(name)
+            
             if not pizzas:
                 return {
                     "success": False,
                     "error": f"No pizza found matching '{name}'"
                 }
             
-            # Filter by size if specified
-            matching_pizza = None
-            for pizza in pizzas:
-                if pizza.size.value.lower() == size.lower():
-                    matching_pizza = pizza
-                    break
-            
-            if not matching_pizza:
-                matching_pizza = pizzas[0]  # Use first match if size not found
+            # Filter by size if specified; the size is resolved once and compared by identity
+            wanted_size = PizzaSize.from_name(size)
+            matching_pizza = next(
+                (pizza for pizza in pizzas if pizza.size is wanted_size),
+                pizzas[0]  # Use first match if size not found
+            )
             
             return {
                 "success": True,
@@ -190,16 +217,24 @@ class OrderUseCases:
             }
     
     async def get_menu(self, category: str = "all") -> Dict[str, Any]:
-        """Get pizza menu"""
+        """Get pizza menu
+        
+        Results are memoized per category and reused until the pizza repository
+        reports a new revision, so callers get the same dict back between menu
+        mutations and must not modify it.
+        """
         try:
+            revision = await self._pizza_repo.get_revision()
+            cached = self._menu_cache.get(category)
+            if cached and cached[0] == revision:
+                return cached[1]
+            
             if category.lower() == "all":
                 pizzas = await self._pizza_repo.get_available_pizzas()
             else:
                 from ...domain.entities import PizzaCategory
                 cat = PizzaCategory.VEG if category.lower() == "veg" else PizzaCategory.NON_VEG
-                pizzas = await self._pizza_repo.get_by_category(cat)
-                # Filter only available ones
-                pizzas = [p for p in pizzas if p.is_available]
+                pizzas = await self._pizza_repo.get_available_by_category(cat)
             
             menu_items = []
             for pizza in pizzas:
@@ -212,12 +247,15 @@ class OrderUseCases:
                     "ingredients": pizza.ingredients
                 })
             
-            return {
+            result = {
                 "success": True,
                 "category": category,
                 "items": menu_items,
                 "total_items": len(menu_items)
             }
+            if category.lower() in _CACHEABLE_MENU_CATEGORIES:
+                self._menu_cache[category] = (revision, result)
+            return result
             
         except Exception as e:
             return {
@@ -24,7 +24,20 @@ class OrderStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Valid status transitions; delivered and cancelled are final states
+_VALID_TRANSITIONS = {
+    OrderStatus.PENDING: frozenset({OrderStatus.CONFIRMED, OrderStatus.CANCELLED}),
+    OrderStatus.CONFIRMED: frozenset({OrderStatus.PREPARING, OrderStatus.CANCELLED}),
+    OrderStatus.PREPARING: frozenset({OrderStatus.COOKING, OrderStatus.CANCELLED}),
+    OrderStatus.COOKING: frozenset({OrderStatus.READY, OrderStatus.CANCELLED}),
+    OrderStatus.READY: frozenset({OrderStatus.OUT_FOR_DELIVERY, OrderStatus.CANCELLED}),
+    OrderStatus.OUT_FOR_DELIVERY: frozenset({OrderStatus.DELIVERED}),
+    OrderStatus.DELIVERED: frozenset(),
+    OrderStatus.CANCELLED: frozenset()
+}
+
+
+@dataclass(slots=True)
 class OrderItem:
     """Individual item in an order"""
     pizza: Pizza
@@ -53,7 +66,7 @@ class OrderItem:
         return base
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomerInfo:
     """Customer information for orders"""
     name: str
@@ -185,19 +198,7 @@ class Order:
     
     def update_status(self, new_status: OrderStatus):
         """Update order status with business rules"""
-        # Define valid status transitions
-        valid_transitions = {
-            OrderStatus.PENDING: [OrderStatus.CONFIRMED, OrderStatus.CANCELLED],
-            OrderStatus.CONFIRMED: [OrderStatus.PREPARING, OrderStatus.CANCELLED],
-            OrderStatus.PREPARING: [OrderStatus.COOKING, OrderStatus.CANCELLED],
-            OrderStatus.COOKING: [OrderStatus.READY, OrderStatus.CANCELLED],
-            OrderStatus.READY: [OrderStatus.OUT_FOR_DELIVERY, OrderStatus.CANCELLED],
-            OrderStatus.OUT_FOR_DELIVERY: [OrderStatus.DELIVERED],
-            OrderStatus.DELIVERED: [],  # Final state
-            OrderStatus.CANCELLED: []   # Final state
-        }
-        
-        if new_status not in valid_transitions.get(self.status, []):
+        if new_status not in _VALID_TRANSITIONS.get(self.status, ()):
             raise ValueError(f"Cannot transition from {self.status.value} to {new_status.value}")
         
         self.status = new_status
@@ -14,6 +14,14 @@ class PizzaSize(Enum):
     MEDIUM = "medium"
     LARGE = "large"
     EXTRA_LARGE = "extra_large"
+    
+    @classmethod
+    def from_name(cls, name: str) -> Optional["PizzaSize"]:
+        """Look up a size by its case-insensitive value, or None if unknown"""
+        return _PIZZA_SIZES_BY_VALUE.get(name.strip().lower())
+
+
+_PIZZA_SIZES_BY_VALUE = {size.value: size for size in PizzaSize}
 
 
 class PizzaCategory(Enum):
@@ -22,7 +30,8 @@ class PizzaCategory(Enum):
     NON_VEG = "non-veg"
 
 
-@dataclass
+# Slotted: every menu entry and order line holds one, and attribute reads are on the hot path
+@dataclass(slots=True)
 class Pizza:
     """Pizza entity representing a pizza item"""
     
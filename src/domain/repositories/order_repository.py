@@ -61,4 +61,14 @@ class IOrderRepository(ABC):
     @abstractmethod
     async def get_customer_order_count(self, email: str) -> int:
         """Get total order count for a customer"""
-        pass 
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def customer_has_orders(self, email: str) -> bool:
+        """Check if a customer has placed at least one order"""
+        pass
+    
+    @abstractmethod
+    async def get_recent_pizza_ids_by_email(self, email: str, limit: int = 20) -> List[str]:
+        """Get distinct pizza IDs from a customer's most recent orders, newest first"""
+        pass
@@ -32,6 +32,16 @@ class IPizzaRepository(ABC):
         """Get pizzas by size"""
         pass
     
+    @abstractmethod
+    async def get_by_name(self, name: str) -> List[Pizza]:
+        """Get pizzas whose name matches exactly (case-insensitive), one per size"""
+        pass
+    
+    @abstractmethod
+    async def get_by_alias(self, alias: str) -> List[Pizza]:
+        """Get pizzas whose legacy menu alias matches exactly (case-insensitive), one per size"""
+        pass
+    
     @abstractmethod
     async def search_by_name(self, name: str) -> List[Pizza]:
         """Search pizzas by name (fuzzy matching)"""
@@ -47,6 +57,16 @@ class IPizzaRepository(ABC):
         """Get only available pizzas"""
         pass
     
+    @abstractmethod
+    async def count_available(self) -> int:
+        """Count available pizzas"""
+        pass
+    
+    @abstractmethod
+    async def get_available_by_category(self, category: PizzaCategory) -> List[Pizza]:
+        """Get available pizzas in a category"""
+        pass
+    
     @abstractmethod
     async def add(self, pizza: Pizza) -> Pizza:
         """Add a new pizza"""
@@ -65,4 +85,9 @@ class IPizzaRepository(ABC):
     @abstractmethod
     async def set_availability(self, pizza_id: str, is_available: bool) -> bool:
         """Set pizza availability"""
-        pass 
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def get_revision(self) -> int:
+        """Get a counter that changes whenever the menu is mutated"""
+        pass
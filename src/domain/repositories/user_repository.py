@@ -4,7 +4,7 @@ Abstract interfaces for user data access.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from ..entities import User
 
@@ -17,6 +17,11 @@ class IUserRepository(ABC):
         """Save a user (create or update)"""
         pass
     
+    @abstractmethod
+    async def upsert(self, email: str, name: str) -> Tuple[User, bool]:
+        """Create a user or update the name of an existing one; returns (user, created)"""
+        pass
+    
     @abstractmethod
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
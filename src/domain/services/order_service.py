@@ -3,16 +3,53 @@ Domain Services - Order Service
 Core business logic for order management that doesn't belong to a specific entity.
 """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 
-from ..entities import Order, OrderItem, OrderStatus, Pizza, CustomerInfo, User
+from ..entities import Order, OrderItem, OrderStatus, Pizza, PizzaSize, CustomerInfo, User
 from ..repositories import IOrderRepository, IPizzaRepository, IUserRepository
 
 
+# Peak hours (11-13, 18-20) add extra preparation time
+_PEAK_HOURS = frozenset({11, 12, 18, 19})
+
+# Progress percentage reported for each order status
+_STATUS_PROGRESS = {
+    OrderStatus.PENDING: 0,
+    OrderStatus.CONFIRMED: 20,
+    OrderStatus.PREPARING: 40,
+    OrderStatus.COOKING: 60,
+    OrderStatus.READY: 80,
+    OrderStatus.OUT_FOR_DELIVERY: 90,
+    OrderStatus.DELIVERED: 100,
+    OrderStatus.CANCELLED: 0
+}
+
+# Orders can only be modified if they're pending or confirmed
+_MODIFIABLE_STATUSES = frozenset({OrderStatus.PENDING, OrderStatus.CONFIRMED})
+
+# Orders can be cancelled unless they're out for delivery or already delivered
+_NON_CANCELLABLE_STATUSES = frozenset({
+    OrderStatus.OUT_FOR_DELIVERY,
+    OrderStatus.DELIVERED,
+    OrderStatus.CANCELLED
+})
+
+
+def _is_modifiable(order: Order) -> bool:
+    return order.status in _MODIFIABLE_STATUSES
+
+
+def _is_cancellable(order: Order) -> bool:
+    return order.status not in _NON_CANCELLABLE_STATUSES
+
+
 class OrderDomainService:
     """Domain service for order-related business logic"""
     
+    __slots__ = ("_order_repo", "_pizza_repo", "_user_repo")
+    
     def __init__(self, 
                  order_repo: IOrderRepository,
                  pizza_repo: IPizzaRepository, 
@@ -80,18 +117,11 @@ class OrderDomainService:
         if not pizzas:
             raise ValueError(f"No pizza found matching '{pizza_name}'")
         
-        # Filter by size if specified
-        size_lower = size.lower() if size else "large"
-        matching_pizza = None
-        
-        for pizza in pizzas:
-            if pizza.size.value.lower() == size_lower:
-                matching_pizza = pizza
-                break
+        # Filter by size if specified; the size is resolved once and compared by identity
+        wanted_size = PizzaSize.from_name(size) if size else PizzaSize.LARGE
         
-        if not matching_pizza:
-            # If no exact size match, use first available
-            matching_pizza = pizzas[0]
+        # If no exact size match, use first available
+        matching_pizza = next((pizza for pizza in pizzas if pizza.size is wanted_size), pizzas[0])
         
         if not matching_pizza.is_available:
             raise ValueError(f"Pizza {matching_pizza.name} is not available")
@@ -111,31 +141,28 @@ class OrderDomainService:
         unique_pizzas = len(set(item.pizza.id for item in order.items))
         complexity_time = min(unique_pizzas * 2, 10)  # Max 10 minutes for complexity
         
+        # Read the clock once for both the peak check and the ETA
+        now = datetime.now()
+        
         # Peak hours adjustment (11-13, 18-20)
-        current_hour = datetime.now().hour
         peak_adjustment = 0
-        if current_hour in [11, 12, 18, 19]:
+        if now.hour in _PEAK_HOURS:
             peak_adjustment = 10  # Add 10 minutes during peak hours
         
         total_minutes = base_time + item_time + complexity_time + peak_adjustment
         
-        return datetime.now() + timedelta(minutes=total_minutes)
+        return now + timedelta(minutes=total_minutes)
     
     async def get_order_suggestions(self, customer_email: str) -> List[Pizza]:
         """Get pizza suggestions based on customer order history"""
         
-        # Get customer's previous orders
-        customer_orders = await self._order_repo.get_by_customer_email(customer_email)
-        
-        if not customer_orders:
+        # Existence check avoids loading the order history for new customers
+        if not await self._order_repo.customer_has_orders(customer_email):
             # New customer - return popular items
             return await self._get_popular_pizzas()
         
-        # Get pizzas the customer has ordered before
-        ordered_pizza_ids = set()
-        for order in customer_orders:
-            for item in order.items:
-                ordered_pizza_ids.add(item.pizza.id)
+        # Get pizzas the customer has ordered recently
+        ordered_pizza_ids = await self._order_repo.get_recent_pizza_ids_by_email(customer_email, limit=20)
         
         # Get those pizzas (if still available)
         previous_pizzas = []
@@ -151,6 +178,21 @@ class OrderDomainService:
         # Fallback to popular pizzas
         return await self._get_popular_pizzas()
     
+    async def get_customer_with_order_count(self, email: str) -> Tuple[Optional[User], int]:
+        """Get a registered customer and how many orders they have placed
+        
+        Convenience wrapper only: users and orders live in separate repositories,
+        so this is still two lookups (run concurrently), not one combined query.
+        """
+        user, order_count = await asyncio.gather(
+            self._user_repo.get_by_email(email),
+            self._order_repo.get_customer_order_count(email)
+        )
+        if not user:
+            return None, 0
+        
+        return user, order_count
+    
     async def _get_popular_pizzas(self) -> List[Pizza]:
         """Get popular pizzas (simplified - in real app would use analytics)"""
         all_pizzas = await self._pizza_repo.get_available_pizzas()
@@ -165,8 +207,7 @@ class OrderDomainService:
         if not order:
             return False
         
-        # Orders can only be modified if they're pending or confirmed
-        return order.status in [OrderStatus.PENDING, OrderStatus.CONFIRMED]
+        return _is_modifiable(order)
     
     async def can_cancel_order(self, order_id: str) -> bool:
         """Check if order can be cancelled"""
@@ -174,8 +215,18 @@ class OrderDomainService:
         if not order:
             return False
         
-        # Orders can be cancelled unless they're out for delivery or already delivered
-        return order.status not in [OrderStatus.OUT_FOR_DELIVERY, OrderStatus.DELIVERED, OrderStatus.CANCELLED]
+        return _is_cancellable(order)
+    
+    async def check_order_policies(self, order_id: str) -> Dict[str, bool]:
+        """Check modify and cancel policies with a single order lookup"""
+        order = await self._order_repo.get_by_id(order_id)
+        if not order:
+            return {"can_modify": False, "can_cancel": False}
+        
+        return {
+            "can_modify": _is_modifiable(order),
+            "can_cancel": _is_cancellable(order)
+        }
     
     async def get_order_progress(self, order_id: str) -> Dict[str, Any]:
         """Get detailed order progress information"""
@@ -183,19 +234,7 @@ class OrderDomainService:
         if not order:
             raise ValueError("Order not found")
         
-        # Calculate progress percentage
-        status_progression = {
-            OrderStatus.PENDING: 0,
-            OrderStatus.CONFIRMED: 20,
-            OrderStatus.PREPARING: 40,
-            OrderStatus.COOKING: 60,
-            OrderStatus.READY: 80,
-            OrderStatus.OUT_FOR_DELIVERY: 90,
-            OrderStatus.DELIVERED: 100,
-            OrderStatus.CANCELLED: 0
-        }
-        
-        progress_percentage = status_progression.get(order.status, 0)
+        progress_percentage = _STATUS_PROGRESS.get(order.status, 0)
         
         return {
             "order_id": order.id,
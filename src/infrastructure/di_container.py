@@ -3,7 +3,7 @@ Infrastructure - Dependency Injection Container
 Sets up all dependencies following clean architecture principles.
 """
 
-from typing import Optional
+from functools import cached_property
 
 from ..application.interfaces import ILLMService
 from ..application.use_cases.order_use_cases import OrderUseCases
@@ -11,6 +11,7 @@ from ..domain.repositories import IPizzaRepository, IOrderRepository, IUserRepos
 from ..domain.services.order_service import OrderDomainService
 
 from .external.groq_llm_service import GroqLLMService
+from .external.batching_llm_service import BatchingLLMService
 from .persistence.in_memory_repositories import (
     InMemoryPizzaRepository, 
     InMemoryOrderRepository, 
@@ -19,59 +20,93 @@ from .persistence.in_memory_repositories import (
 
 
 class DIContainer:
-    """Dependency injection container for the application"""
+    """Dependency injection container for the application
     
-    def __init__(self):
-        self._pizza_repository: Optional[IPizzaRepository] = None
-        self._order_repository: Optional[IOrderRepository] = None
-        self._user_repository: Optional[IUserRepository] = None
-        self._llm_service: Optional[ILLMService] = None
-        self._order_domain_service: Optional[OrderDomainService] = None
-        self._order_use_cases: Optional[OrderUseCases] = None
+    Each dependency is built lazily on first access and then served straight
+    from the instance ``__dict__`` by ``cached_property``.
+    """
     
     # Repository implementations
+    @cached_property
+    def pizza_repository(self) -> IPizzaRepository:
+        return InMemoryPizzaRepository()
+    
+    @cached_property
+    def order_repository(self) -> IOrderRepository:
+        return InMemoryOrderRepository()
+    
+    @cached_property
+    def user_repository(self) -> IUserRepository:
+        return InMemoryUserRepository()
+    
+    # External service implementations
+    @cached_property
+    def llm_service(self) -> ILLMService:
+        return BatchingLLMService(GroqLLMService())
+    
+    # Domain services
+    @cached_property
+    def order_domain_service(self) -> OrderDomainService:
+        return OrderDomainService(
+            order_repo=self.order_repository,
+            pizza_repo=self.pizza_repository,
+            user_repo=self.user_repository
+        )
+    
+    # Application use cases
+    @cached_property
+    def order_use_cases(self) -> OrderUseCases:
+        return OrderUseCases(
+            order_repo=self.order_repository,
+            pizza_repo=self.pizza_repository,
+            user_repo=self.user_repository,
+            llm_service=self.llm_service
+        )
+    
+    # Getter aliases kept for existing callers
     def get_pizza_repository(self) -> IPizzaRepository:
-        if self._pizza_repository is None:
-            self._pizza_repository = InMemoryPizzaRepository()
-        return self._pizza_repository
+        return self.pizza_repository
     
     def get_order_repository(self) -> IOrderRepository:
-        if self._order_repository is None:
-            self._order_repository = InMemoryOrderRepository()
-        return self._order_repository
+        return self.order_repository
     
     def get_user_repository(self) -> IUserRepository:
-        if self._user_repository is None:
-            self._user_repository = InMemoryUserRepository()
-        return self._user_repository
+        return self.user_repository
     
-    # External service implementations
     def get_llm_service(self) -> ILLMService:
-        if self._llm_service is None:
-            self._llm_service = GroqLLMService()
-        return self._llm_service
+        return self.llm_service
     
-    # Domain services
     def get_order_domain_service(self) -> OrderDomainService:
-        if self._order_domain_service is None:
-            self._order_domain_service = OrderDomainService(
-                order_repo=self.get_order_repository(),
-                pizza_repo=self.get_pizza_repository(),
-                user_repo=self.get_user_repository()
-            )
-        return self._order_domain_service
+        return self.order_domain_service
     
-    # Application use cases
     def get_order_use_cases(self) -> OrderUseCases:
-        if self._order_use_cases is None:
-            self._order_use_cases = OrderUseCases(
-                order_repo=self.get_order_repository(),
-                pizza_repo=self.get_pizza_repository(),
-                user_repo=self.get_user_repository(),
-                llm_service=self.get_llm_service()
-            )
-        return self._order_use_cases
+        return self.order_use_cases
 
 
 # Global container instance
-container = DIContainer() 
\ No newline at end of file
+container = DIContainer()
+
+
+# Module-level accessors for the global container
+def pizza_repository() -> IPizzaRepository:
+    return container.pizza_repository
+
+
+def order_repository() -> IOrderRepository:
+    return container.order_repository
+
+
+def user_repository() -> IUserRepository:
+    return container.user_repository
+
+
+def llm_service() -> ILLMService:
+    return container.llm_service
+
+
+def order_domain_service() -> OrderDomainService:
+    return container.order_domain_service
+
+
+def order_use_cases() -> OrderUseCases:
+    return container.order_use_cases
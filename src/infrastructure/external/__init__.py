@@ -4,5 +4,6 @@ Implementations of external service interfaces.
 """
 
 from .groq_llm_service import GroqLLMService
+from .batching_llm_service import BatchingLLMService
 
-__all__ = ['GroqLLMService'] 
\ No newline at end of file
+__all__ = ['GroqLLMService', 'BatchingLLMService'] 
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Infrastructure - Batching LLM Service
+Decorator that coalesces concurrent LLM prompt calls into short batching windows.
+"""
+
+import asyncio
+import copy
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, Hashable, Set, AsyncIterator
+
+import orjson
+
+from ...application.interfaces import ILLMService
+from ...domain.entities import Order, Pizza
+
+# How long the first prompt of a batch waits for others to join it. Every batched call
+# pays this delay; the gain is that identical calls in the window share one upstream call
+_BATCH_WINDOW_SECONDS = 0.005
+
+# A window is flushed early once this many distinct calls are waiting
+_MAX_BATCH_SIZE = 32
+
+PendingCall = Tuple[Callable[[], Awaitable[Any]], "asyncio.Future[Any]"]
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    """Retrieve a finished future's exception so asyncio doesn't report it as unhandled"""
+    if not future.cancelled():
+        future.exception()
+
+
+def _cancel_unresolved(batch: List[PendingCall], task: "asyncio.Task[None]") -> None:
+    """Cancel the futures a finished batch task left unresolved"""
+    for _, future in batch:
+        if not future.done():
+            future.cancel()
+
+
+class BatchingLLMService(ILLMService):
+    """LLM service wrapper that batches prompt generation calls
+    
+    Intent parsing, free-form responses and the welcome, suggestions and error
+    messages arriving within the same window are collected and sent to the wrapped
+    service together, up to ``max_batch_size`` calls per batch. Identical calls in
+    a window share a single upstream call.
+    
+    Groq has no batch endpoint, so a batch is still one request per distinct call,
+    sent concurrently. The only saving is the merging of identical calls, which
+    costs every call up to one window of added latency.
+    """
+    
+    def __init__(self, inner: ILLMService, window: float = _BATCH_WINDOW_SECONDS,
+                 max_batch_size: int = _MAX_BATCH_SIZE):
+        self._inner = inner
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, PendingCall] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set["asyncio.Task[None]"] = set()
+    
+    async def parse_user_intent(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Parse user message to determine intent and extract parameters"""
+        key = ("parse_user_intent", message, self._context_key(context))
+        intent = await self._submit(key, partial(self._inner.parse_user_intent, message, context))
+        # Callers joined on one call each get their own copy to modify
+        return copy.deepcopy(intent)
+    
+    async def generate_response(self, prompt: str, context: Dict[str, Any] = None) -> str:
+        """Generate a response using the LLM"""
+        key = ("generate_response", prompt, self._context_key(context))
+        return await self._submit(key, partial(self._inner.generate_response, prompt, context))
+    
+    async def generate_order_confirmation_message(self, order: Order) -> str:
+        """Generate order confirmation message"""
+        return await self._inner.generate_order_confirmation_message(order)
+    
+    async def generate_tracking_message(self, order: Order) -> str:
+        """Generate order tracking message"""
+        return await self._inner.generate_tracking_message(order)
+    
+    async def generate_suggestions_message(self, pizzas: List[Pizza], preferences: str) -> str:
+        """Generate pizza suggestions message"""
+        key = ("generate_suggestions_message", tuple(pizza.id for pizza in pizzas), preferences)
+        return await self._submit(key, partial(self._inner.generate_suggestions_message, pizzas, preferences))
+    
+    async def generate_welcome_message(self, user_name: Optional[str] = None, is_new_user: bool = False) -> str:
+        """Generate welcome message"""
+        key = ("generate_welcome_message", user_name, is_new_user)
+        return await self._submit(key, partial(self._inner.generate_welcome_message, user_name, is_new_user))
+    
+    async def generate_error_message(self, error: str, context: Dict[str, Any] = None) -> str:
+        """Generate user-friendly error message"""
+        key = ("generate_error_message", error, self._context_key(context))
+        return await self._submit(key, partial(self._inner.generate_error_message, error, context))
+    
+    def stream_order_confirmation_message(self, order: Order) -> AsyncIterator[str]:
+        """Stream the order confirmation message; streams are never batched"""
+        return self._inner.stream_order_confirmation_message(order)
+    
+    def stream_welcome_message(self, user_name: Optional[str] = None,
+                               is_new_user: bool = False) -> AsyncIterator[str]:
+        """Stream the welcome message; streams are never batched"""
+        return self._inner.stream_welcome_message(user_name, is_new_user)
+    
+    async def aclose(self) -> None:
+        """Release the wrapped service's connections"""
+        await self._inner.aclose()
+    
+    @staticmethod
+    def _context_key(context: Optional[Dict[str, Any]]) -> bytes:
+        """Hashable form of a call context"""
+        if not context:
+            return b""
+        return orjson.dumps(context, option=orjson.OPT_SORT_KEYS, default=str)
+    
+    def _submit(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        """Queue a call for the current window, joining an identical pending call"""
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            # Mark errors as retrieved, so a batch whose callers were all cancelled doesn't log them
+            future.add_done_callback(_consume_exception)
+            pending = (call, future)
+            self._pending[key] = pending
+            if len(self._pending) >= self._max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self._window, self._flush)
+        
+        # Shield the shared future so one cancelled caller doesn't cancel the others
+        return asyncio.shield(pending[1])
+    
+    def _flush(self) -> None:
+        """Close the current window and dispatch its calls"""
+        batch = list(self._pending.values())
+        self._pending = {}
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+        # A batch cancelled before it resolved its calls (e.g. at shutdown) must not leave callers waiting
+        task.add_done_callback(partial(_cancel_unresolved, batch))
+    
+    async def _run_batch(self, batch: List[PendingCall]) -> None:
+        """Run a batch of calls concurrently and resolve their futures"""
+        results = await asyncio.gather(*(call() for call, _ in batch), return_exceptions=True)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -4,17 +4,164 @@ Concrete implementation of LLM service using Groq API.
 """
 
 import os
-import json
 import re
-from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import partial
+from typing import List, Dict, Any, Optional, Literal, AsyncIterator, Callable, Tuple, TYPE_CHECKING
 from dotenv import load_dotenv
+import httpx
+import orjson
+from pydantic import BaseModel, Field
 
 from ...application.interfaces import ILLMService
 from ...domain.entities import Order, Pizza
+from .intent_fallback import EXACT_INTENT_CONFIDENCE, detect_intent
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shown to the user when the Groq API call fails
+_FALLBACK_RESPONSE = "I'm having trouble generating a response right now. Please try again!"
+
+# Maximum number of prompts whose generated responses are memoized
+_RESPONSE_CACHE_SIZE = 128
+
+IntentName = Literal[
+    "get_menu", "find_pizza", "place_order", "track_order",
+    "check_user", "save_user", "get_suggestions", "general_chat"
+]
+
+
+class Intent(BaseModel):
+    """Parsed intent as returned by the model"""
+    intent: IntentName
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    confidence: float = Field(ge=0.0, le=1.0)
+    explanation: Optional[str] = None
+
+
+# Static intent classification instructions. Sent as the system message so every
+# request shares the same prompt prefix and only the user message differs.
+_INTENT_SYSTEM_PROMPT = """Classify a pizza ordering message. Reply with one JSON object:
+{"intent": ..., "parameters": {...}, "confidence": 0-1}
+
+Intents and parameters:
+get_menu (category: all|veg|non-veg), find_pizza (name, size), place_order (items, customer info),
+track_order (order_id or email), check_user (email), save_user (email, name),
+get_suggestions (preferences), general_chat
+
+Examples:
+"show me veg pizzas" -> {"intent": "get_menu", "parameters": {"category": "veg"}, "confidence": 0.95}
+"where is order ab12" -> {"intent": "track_order", "parameters": {"order_id": "ab12"}, "confidence": 0.9}
+"hi there" -> {"intent": "general_chat", "parameters": {}, "confidence": 0.9}"""
+
+# Prompt templates for the free-text replies, filled with str.format. Kept flush-left
+# so the indentation of the calling code isn't sent to the model as extra tokens.
+_ORDER_CONFIRMATION_PROMPT = """Generate a friendly order confirmation message for a pizza order.
+
+Order details:
+- Order ID: {order_id}
+- Customer: {customer}
+- Items: {items}
+- Total: {total}
+- ETA: {eta}
+
+Make it enthusiastic, include emojis, and mention the estimated delivery time.
+Keep it concise but warm."""
+
+_TRACKING_PROMPT = """Generate a helpful order tracking message.
+
+Order details:
+- Order ID: {order_id}
+- Status: {status}
+- Items: {items}
+- ETA: {eta}
+- Customer: {customer}
+
+Make it informative, include appropriate emojis for the status, and reassuring.
+If the order is ready, be excited. If it's still cooking, be encouraging."""
+
+_SUGGESTIONS_PROMPT = """Generate an enthusiastic message about pizza recommendations.
+
+Preferences: {preferences}
+Suggested pizzas:
+{suggestions}
+
+Make it appetizing, use food emojis, and encourage the customer to try something new.
+Be friendly and helpful."""
+
+_WELCOME_PROMPT = """Generate a warm welcome message for a pizza ordering system.
+
+Customer name: {name}
+User type: {user_type}
+
+Make it friendly, include pizza emojis, and mention what they can do (see menu, order, track orders).
+Keep it brief but welcoming."""
+
+_ERROR_PROMPT = """Convert this technical error into a friendly, helpful message for a pizza customer:
+
+Error: {error}
+Context: {context}
+
+Make it apologetic, suggest what they can try instead, and keep the tone light.
+Don't include technical details."""
+
+# Upper bound on in-flight Groq requests; matches the HTTP connection pool size
+_MAX_CONCURRENT_REQUESTS = 64
+_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Transient failures (connection errors, 408/409/429, 5xx) are retried by the client with
+# exponential backoff and jitter, honouring Retry-After; each attempt is bounded by the timeout
+_MAX_RETRIES = 3
+_REQUEST_TIMEOUT_SECONDS = 15.0
+_CONNECT_TIMEOUT_SECONDS = 2.0
+
+# Maximum number of parsed intents kept, keyed by message and context
+_INTENT_CACHE_SIZE = 2048
+
+# Intent cache keys only fold case and spacing; punctuation is kept because it can
+# carry parameters (emails, order IDs, sizes) that the cached intent would repeat
+_WHITESPACE = re.compile(r"\s+")
+
+# Fallback results at or above this confidence are returned without calling the API.
+# Only exact phrase matches reach it; set PIZZA_FAST_PATH=0 to always ask the model.
+_FAST_PATH_ENABLED = os.getenv("PIZZA_FAST_PATH", "1") == "1"
+_FAST_PATH_MIN_CONFIDENCE = EXACT_INTENT_CONFIDENCE
+
+# Connection pool and request slots per event loop, shared by every service instance
+# on that loop. Both are bound to the loop that created them, so they can't be shared
+# across loops (a second asyncio.run, one loop per test).
+_loop_pools: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]] = {}
+
+
+def _pool_for_running_loop() -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    """Get the shared connection pool and request slots of the running loop, creating them if needed"""
+    loop = asyncio.get_running_loop()
+    pool = _loop_pools.get(loop)
+    if pool is None:
+        # Pools of closed loops can never be used again; their connections went with the loop
+        for stale in [other for other in _loop_pools if other.is_closed()]:
+            del _loop_pools[stale]
+        pool = (
+            httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=_MAX_CONCURRENT_REQUESTS,
+                    max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS
+                )
+            ),
+            asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        )
+        _loop_pools[loop] = pool
+    return pool
+
 
 class GroqLLMService(ILLMService):
     """Groq implementation of LLM service"""
@@ -22,108 +169,170 @@ class GroqLLMService(ILLMService):
     def __init__(self):
         """Initialize Groq client"""
         try:
-            from groq import Groq
+            from groq import AsyncGroq
             
             api_key = os.getenv("GROQ_API_KEY")
             if not api_key:
                 raise ValueError("GROQ_API_KEY not found in environment variables")
             
-            self.client = Groq(api_key=api_key)
+            self._client_factory: Callable[..., "AsyncGroq"] = partial(
+                AsyncGroq,
+                api_key=api_key,
+                max_retries=_MAX_RETRIES,
+                timeout=httpx.Timeout(_REQUEST_TIMEOUT_SECONDS, connect=_CONNECT_TIMEOUT_SECONDS)
+            )
+            # Client over the running loop's shared pool, bound lazily (see _connect)
+            self._http: Optional[httpx.AsyncClient] = None
+            self._client: Optional["AsyncGroq"] = None
+            self._request_slots: Optional[asyncio.Semaphore] = None
             self.model = "llama-3.1-7b-instant"
+            self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+            # Intent results stored as JSON so every hit hands out a fresh dict
+            self._intent_cache: "OrderedDict[str, bytes]" = OrderedDict()
+            self._intent_cache_stats = {"hits": 0, "misses": 0, "fast_path": 0}
             
         except ImportError:
             raise ImportError("Groq library not installed. Run: pip install groq")
     
+    def _connect(self) -> None:
+        """Point the client at the running loop's shared pool and request slots
+        
+        Every instance on a loop shares one pool, so a recreated service reuses warm
+        keep-alive connections instead of opening new TLS sessions.
+        """
+        http, request_slots = _pool_for_running_loop()
+        if self._http is not http:
+            self._http = http
+            self._client = self._client_factory(http_client=http)
+            self._request_slots = request_slots
+    
+    async def aclose(self) -> None:
+        """Close the running loop's shared connection pool"""
+        self._http = self._client = self._request_slots = None
+        pool = _loop_pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool[0].aclose()
+    
     async def parse_user_intent(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Parse user message to determine intent and extract parameters"""
         
         if context is None:
             context = {}
         
-        intent_prompt = f"""
-        Analyze this pizza ordering message and determine the user's intent: "{message}"
-        
-        Context: {json.dumps(context)}
-        
-        Available intents:
-        - get_menu: User wants to see the menu (categories: all/veg/non-veg)
-        - find_pizza: User wants to find a specific pizza (extract: name, size)
-        - place_order: User wants to place an order (extract: items, customer info)
-        - track_order: User wants to track an order (extract: order_id or email)
-        - check_user: User wants to check if they exist (extract: email)
-        - save_user: User wants to save their info (extract: email, name)
-        - get_suggestions: User wants recommendations (extract: preferences)
-        - general_chat: General conversation or greetings
-        
-        Return ONLY a valid JSON object:
-        {{
-            "intent": "intent_name",
-            "parameters": {{"param1": "value1", "param2": "value2"}},
-            "confidence": 0.95,
-            "explanation": "brief explanation"
-        }}
-        """
+        if _FAST_PATH_ENABLED:
+            quick = self._fallback_intent_detection(message)
+            if quick["confidence"] >= _FAST_PATH_MIN_CONFIDENCE:
+                self._intent_cache_stats["fast_path"] += 1
+                return quick
+        
+        cache_key = self._intent_cache_key(message, context)
+        cached = self._intent_cache.get(cache_key)
+        if cached is not None:
+            self._intent_cache.move_to_end(cache_key)
+            self._intent_cache_stats["hits"] += 1
+            return orjson.loads(cached)
+        self._intent_cache_stats["misses"] += 1
+        
+        # Only this short suffix varies per request; the instructions stay a stable prefix
+        intent_prompt = f'Message: "{message}"\nContext: {orjson.dumps(context, default=str).decode()}'
         
         try:
-            response = self._generate_sync_response(intent_prompt, max_tokens=300)
+            # JSON mode guarantees a parseable object; the Intent model checks its shape
+            self._connect()
+            async with self._request_slots:
+                completion = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": _INTENT_SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": intent_prompt
+                        }
+                    ],
+                    max_tokens=150,
+                    temperature=0.7,
+                    response_format={"type": "json_object"}
+                )
             
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                # Fallback intent detection
-                return self._fallback_intent_detection(message)
+            # Validation rejects unknown intents and malformed fields, which then use the fallback
+            intent_data = Intent.model_validate_json(completion.choices[0].message.content).model_dump()
                 
         except Exception as e:
-            print(f"Intent parsing error: {e}")
+            # Fallback results aren't cached, so the next identical message retries the API
+            logger.warning("Intent parsing error: %s", e)
             return self._fallback_intent_detection(message)
+        
+        logger.debug("intent=%s confidence=%s message=%r", intent_data["intent"], intent_data["confidence"], message)
+        self._intent_cache[cache_key] = orjson.dumps(intent_data)
+        if len(self._intent_cache) > _INTENT_CACHE_SIZE:
+            self._intent_cache.popitem(last=False)
+        return intent_data
     
-    async def generate_response(self, prompt: str, context: Dict[str, Any] = None) -> str:
-        """Generate a response using the LLM"""
-        return self._generate_sync_response(prompt)
+    @staticmethod
+    def _intent_cache_key(message: str, context: Dict[str, Any]) -> str:
+        """Cache key for an intent lookup: case- and spacing-folded message plus the context it was parsed with"""
+        raw = _WHITESPACE.sub(" ", message.lower()).strip().encode() + b"|" + orjson.dumps(
+            context, option=orjson.OPT_SORT_KEYS, default=str
+        )
+        return hashlib.sha256(raw).hexdigest()
     
-    async def generate_order_confirmation_message(self, order: Order) -> str:
-        """Generate order confirmation message"""
-        
-        items_list = ", ".join([item.display_name for item in order.items])
-        
-        prompt = f"""
-        Generate a friendly order confirmation message for a pizza order.
-        
-        Order details:
-        - Order ID: {order.id}
-        - Customer: {order.customer.name}
-        - Items: {items_list}
-        - Total: {order.formatted_total}
-        - ETA: {order.estimated_eta}
+    async def generate_response(self, prompt: str, context: Dict[str, Any] = None) -> str:
+        """Generate a response using the LLM
         
-        Make it enthusiastic, include emojis, and mention the estimated delivery time.
-        Keep it concise but warm.
+        Successful responses are memoized per prompt (LRU), so templated prompts
+        such as the menu greeting only reach the API once.
         """
+        cached = self._response_cache.get(prompt)
+        if cached is not None:
+            self._response_cache.move_to_end(prompt)
+            return cached
+        
+        try:
+            response = await self._complete(prompt)
+        except Exception as e:
+            logger.warning("Groq API error: %s", e)
+            return _FALLBACK_RESPONSE
         
-        return self._generate_sync_response(prompt, max_tokens=200)
+        self._response_cache[prompt] = response
+        if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return response
+    
+    async def generate_order_confirmation_message(self, order: Order) -> str:
+        """Generate order confirmation message"""
+        return await self._generate_safe_response(self._order_confirmation_prompt(order), max_tokens=200)
+    
+    async def stream_order_confirmation_message(self, order: Order) -> AsyncIterator[str]:
+        """Stream the order confirmation message as tokens arrive"""
+        async for chunk in self._stream_safe_response(self._order_confirmation_prompt(order), max_tokens=200):
+            yield chunk
+    
+    @staticmethod
+    def _order_confirmation_prompt(order: Order) -> str:
+        """Prompt for an order confirmation message"""
+        return _ORDER_CONFIRMATION_PROMPT.format(
+            order_id=order.id,
+            customer=order.customer.name,
+            items=", ".join([item.display_name for item in order.items]),
+            total=order.formatted_total,
+            eta=order.estimated_eta
+        )
     
     async def generate_tracking_message(self, order: Order) -> str:
         """Generate order tracking message"""
         
-        items_list = ", ".join([item.display_name for item in order.items])
-        
-        prompt = f"""
-        Generate a helpful order tracking message.
-        
-        Order details:
-        - Order ID: {order.id}
-        - Status: {order.status.value}
-        - Items: {items_list}
-        - ETA: {order.estimated_eta}
-        - Customer: {order.customer.name}
+        prompt = _TRACKING_PROMPT.format(
+            order_id=order.id,
+            status=order.status.value,
+            items=", ".join([item.display_name for item in order.items]),
+            eta=order.estimated_eta,
+            customer=order.customer.name
+        )
         
-        Make it informative, include appropriate emojis for the status, and reassuring.
-        If the order is ready, be excited. If it's still cooking, be encouraging.
-        """
-        
-        return self._generate_sync_response(prompt, max_tokens=200)
+        return await self._generate_safe_response(prompt, max_tokens=200)
     
     async def generate_suggestions_message(self, pizzas: List[Pizza], preferences: str) -> str:
         """Generate pizza suggestions message"""
@@ -132,90 +341,108 @@ class GroqLLMService(ILLMService):
         for pizza in pizzas[:5]:  # Limit to 5 suggestions
             pizza_list.append(f"{pizza.display_name} - {pizza.formatted_price} ({pizza.description})")
         
-        suggestions_text = "\n".join(pizza_list)
-        
-        prompt = f"""
-        Generate an enthusiastic message about pizza recommendations.
+        prompt = _SUGGESTIONS_PROMPT.format(preferences=preferences, suggestions="\n".join(pizza_list))
         
-        Preferences: {preferences}
-        Suggested pizzas:
-        {suggestions_text}
-        
-        Make it appetizing, use food emojis, and encourage the customer to try something new.
-        Be friendly and helpful.
-        """
-        
-        return self._generate_sync_response(prompt, max_tokens=200)
+        return await self._generate_safe_response(prompt, max_tokens=200)
     
     async def generate_welcome_message(self, user_name: Optional[str] = None, is_new_user: bool = False) -> str:
         """Generate welcome message"""
-        
-        name_part = f" {user_name}" if user_name else ""
-        user_type = "new customer" if is_new_user else "returning customer"
-        
-        prompt = f"""
-        Generate a warm welcome message for a pizza ordering system.
-        
-        Customer name: {user_name or "Customer"}
-        User type: {user_type}
-        
-        Make it friendly, include pizza emojis, and mention what they can do (see menu, order, track orders).
-        Keep it brief but welcoming.
-        """
-        
-        return self._generate_sync_response(prompt, max_tokens=150)
+        return await self._generate_safe_response(self._welcome_prompt(user_name, is_new_user), max_tokens=150)
+    
+    async def stream_welcome_message(self, user_name: Optional[str] = None,
+                                     is_new_user: bool = False) -> AsyncIterator[str]:
+        """Stream the welcome message as tokens arrive"""
+        async for chunk in self._stream_safe_response(self._welcome_prompt(user_name, is_new_user), max_tokens=150):
+            yield chunk
+    
+    @staticmethod
+    def _welcome_prompt(user_name: Optional[str], is_new_user: bool) -> str:
+        """Prompt for a welcome message"""
+        return _WELCOME_PROMPT.format(
+            name=user_name or "Customer",
+            user_type="new customer" if is_new_user else "returning customer"
+        )
     
     async def generate_error_message(self, error: str, context: Dict[str, Any] = None) -> str:
         """Generate user-friendly error message"""
         
-        prompt = f"""
-        Convert this technical error into a friendly, helpful message for a pizza customer:
+        prompt = _ERROR_PROMPT.format(error=error, context=orjson.dumps(context or {}, default=str).decode())
         
-        Error: {error}
-        Context: {json.dumps(context or {})}
-        
-        Make it apologetic, suggest what they can try instead, and keep the tone light.
-        Don't include technical details.
-        """
-        
-        return self._generate_sync_response(prompt, max_tokens=100)
+        return await self._generate_safe_response(prompt, max_tokens=100)
+    
+    async def _generate_safe_response(self, prompt: str, max_tokens: int = 500) -> str:
+        """Generate a response, falling back to a canned reply on API errors"""
+        try:
+            return await self._complete(prompt, max_tokens)
+        except Exception as e:
+            logger.warning("Groq API error: %s", e)
+            return _FALLBACK_RESPONSE
     
-    def _generate_sync_response(self, prompt: str, max_tokens: int = 500) -> str:
-        """Generate response synchronously"""
+    async def _stream_safe_response(self, prompt: str, max_tokens: int = 500) -> AsyncIterator[str]:
+        """Stream a response, falling back to a canned reply if the API fails before any text arrives"""
+        started = False
         try:
-            completion = self.client.chat.completions.create(
+            async for chunk in self._stream(prompt, max_tokens):
+                started = True
+                yield chunk
+        except Exception as e:
+            logger.warning("Groq API error: %s", e)
+            if not started:
+                yield _FALLBACK_RESPONSE
+    
+    async def _complete(self, prompt: str, max_tokens: int = 500) -> str:
+        """Run a chat completion, raising on API errors"""
+        self._connect()
+        async with self._request_slots:
+            completion = await self._client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a helpful assistant for a pizza ordering system. Be friendly, concise, and use appropriate emojis."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
+                messages=self._assistant_messages(prompt),
                 max_tokens=max_tokens,
                 temperature=0.7
             )
+        
+        return completion.choices[0].message.content.strip()
+    
+    async def _stream(self, prompt: str, max_tokens: int = 500) -> AsyncIterator[str]:
+        """Run a streaming chat completion, yielding text deltas and raising on API errors"""
+        self._connect()
+        async with self._request_slots:
+            stream = await self._client.chat.completions.create(
+                model=self.model,
+                messages=self._assistant_messages(prompt),
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True
+            )
             
-            return completion.choices[0].message.content.strip()
-            
-        except Exception as e:
-            print(f"Groq API error: {e}")
-            return "I'm having trouble generating a response right now. Please try again!"
+            # Closing the stream releases the connection even if the consumer stops early
+            async with stream:
+                leading = True
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if leading and text:
+                        # Match _complete, which strips the leading whitespace models often emit
+                        text = text.lstrip()
+                    if text:
+                        leading = False
+                        yield text
+    
+    @staticmethod
+    def _assistant_messages(prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for a free-text assistant reply"""
+        return [
+            {
+                "role": "system", 
+                "content": "You are a helpful assistant for a pizza ordering system. Be friendly, concise, and use appropriate emojis."
+            },
+            {
+                "role": "user", 
+                "content": prompt
+            }
+        ]
     
     def _fallback_intent_detection(self, message: str) -> Dict[str, Any]:
         """Simple fallback intent detection"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ["menu", "show", "list", "what do you have"]):
-            return {"intent": "get_menu", "parameters": {"category": "all"}, "confidence": 0.8}
-        elif any(word in message_lower for word in ["track", "order", "status", "where is"]):
-            return {"intent": "track_order", "parameters": {}, "confidence": 0.8}
-        elif any(word in message_lower for word in ["suggest", "recommend", "popular", "best"]):
-            return {"intent": "get_suggestions", "parameters": {"preferences": "popular"}, "confidence": 0.8}
-        elif any(word in message_lower for word in ["pizza", "want", "order", "buy"]):
-            return {"intent": "find_pizza", "parameters": {"name": "margherita", "size": "large"}, "confidence": 0.7}
-        else:
-            return {"intent": "general_chat", "parameters": {}, "confidence": 0.6} 
\ No newline at end of file
+        return detect_intent(message)
\ No newline at end of file
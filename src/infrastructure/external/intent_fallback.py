@@ -0,0 +1,76 @@
+"""
+Infrastructure - Intent Fallback
+Keyword-based intent detection used for the LLM fast path and when the API is unavailable.
+"""
+
+import re
+from typing import Any, Dict, Final, Tuple
+
+IntentRule = Tuple["re.Pattern[str]", str, Dict[str, str], float]
+
+# Message normalization for exact-phrase lookups: punctuation and spacing don't change intent
+_PUNCTUATION: Final = re.compile(r"[^\w\s]+")
+_WHITESPACE: Final = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Reduce a message to lowercase words so trivial variants of a phrase compare equal"""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", message.lower())).strip()
+
+
+def _keyword_pattern(*keywords: str) -> "re.Pattern[str]":
+    """Compile keywords into one alternation that matches any of them as a substring"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+def _exact(messages: Tuple[str, ...], intent: str,
+           parameters: Dict[str, str]) -> Dict[str, Tuple[str, Dict[str, str]]]:
+    """Map each normalized message to the same intent and parameters"""
+    return {message: (intent, parameters) for message in messages}
+
+
+# Keyword rules; first matching rule wins
+_FALLBACK_RULES: Final[Tuple[IntentRule, ...]] = (
+    (_keyword_pattern("menu", "show", "list", "what do you have"),
+     "get_menu", {"category": "all"}, 0.8),
+    (_keyword_pattern("track", "order", "status", "where is"),
+     "track_order", {}, 0.8),
+    (_keyword_pattern("suggest", "recommend", "popular", "best"),
+     "get_suggestions", {"preferences": "popular"}, 0.8),
+    (_keyword_pattern("pizza", "want", "order", "buy"),
+     "find_pizza", {"name": "margherita", "size": "large"}, 0.7),
+)
+
+# Whole messages (after normalization) that need no LLM round-trip to classify
+_EXACT_INTENTS: Final[Dict[str, Tuple[str, Dict[str, str]]]] = {
+    **_exact(("menu", "show menu", "the menu", "show me the menu", "full menu"),
+             "get_menu", {"category": "all"}),
+    **_exact(("veg menu", "veg pizzas", "vegetarian menu"),
+             "get_menu", {"category": "veg"}),
+    **_exact(("non veg menu", "non veg pizzas"),
+             "get_menu", {"category": "non-veg"}),
+    **_exact(("track", "track order", "track my order", "order status", "where is my order"),
+             "track_order", {}),
+    **_exact(("suggest", "suggestions", "recommend", "recommendations", "popular"),
+             "get_suggestions", {"preferences": "popular"}),
+    **_exact(("hi", "hello", "hey", "thanks", "thank you"),
+             "general_chat", {}),
+}
+
+EXACT_INTENT_CONFIDENCE: Final = 0.9
+_DEFAULT_CONFIDENCE: Final = 0.6
+
+
+def detect_intent(message: str) -> Dict[str, Any]:
+    """Classify a message by exact phrase, then by keyword, defaulting to general chat"""
+    exact = _EXACT_INTENTS.get(normalize_message(message))
+    if exact is not None:
+        return {"intent": exact[0], "parameters": dict(exact[1]), "confidence": EXACT_INTENT_CONFIDENCE}
+    
+    message_lower = message.lower()
+    
+    for pattern, intent, parameters, confidence in _FALLBACK_RULES:
+        if pattern.search(message_lower):
+            return {"intent": intent, "parameters": dict(parameters), "confidence": confidence}
+    
+    return {"intent": "general_chat", "parameters": {}, "confidence": _DEFAULT_CONFIDENCE}
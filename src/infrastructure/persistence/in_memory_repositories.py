@@ -3,12 +3,15 @@ Infrastructure - In-Memory Repository Implementations
 Concrete implementations of domain repository interfaces using in-memory storage.
 """
 
-from typing import List, Optional, Dict, Any
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from operator import itemgetter
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from ...domain.entities import Pizza, Order, User, PizzaSize, PizzaCategory, OrderStatus
 from ...domain.repositories import IPizzaRepository, IOrderRepository, IUserRepository
-from ...domain.data.menu_data import get_default_menu
+from ...domain.data.menu_data import get_default_menu, LEGACY_MENU_MAPPING
 
 
 class InMemoryPizzaRepository(IPizzaRepository):
@@ -16,9 +19,61 @@ class InMemoryPizzaRepository(IPizzaRepository):
     
     def __init__(self):
         self._pizzas: Dict[str, Pizza] = {}
+        # Secondary indexes of pizza IDs; dicts are used as insertion-ordered sets
+        # so filtered results keep menu order
+        self._by_category: Dict[PizzaCategory, Dict[str, None]] = {}
+        self._by_size: Dict[PizzaSize, Dict[str, None]] = {}
+        self._available: Dict[str, None] = {}
+        self._available_by_category: Dict[PizzaCategory, Dict[str, None]] = {}
+        # Lowercased search corpus, computed once per mutation instead of per query
+        self._name_lower: Dict[str, str] = {}
+        self._ids_by_name: Dict[str, Dict[str, None]] = {}
+        self._ids_by_alias: Dict[str, Dict[str, None]] = {}
+        self._ingredients_lower: Dict[str, List[str]] = {}
+        # Bumped on every mutation so callers can invalidate cached menu views
+        self._revision = 0
         # Load default menu
         for pizza in get_default_menu():
             self._pizzas[pizza.id] = pizza
+        self._reindex()
+    
+    def _reindex(self):
+        """Rebuild the secondary indexes after a mutation (writes are rare, reads are hot)"""
+        by_category: Dict[PizzaCategory, Dict[str, None]] = defaultdict(dict)
+        by_size: Dict[PizzaSize, Dict[str, None]] = defaultdict(dict)
+        available: Dict[str, None] = {}
+        available_by_category: Dict[PizzaCategory, Dict[str, None]] = defaultdict(dict)
+        
+        for pizza_id, pizza in self._pizzas.items():
+            by_category[pizza.category][pizza_id] = None
+            by_size[pizza.size][pizza_id] = None
+            if pizza.is_available:
+                available[pizza_id] = None
+                available_by_category[pizza.category][pizza_id] = None
+        
+        self._by_category = dict(by_category)
+        self._by_size = dict(by_size)
+        self._available = available
+        self._available_by_category = dict(available_by_category)
+        self._name_lower = {
+            pizza_id: pizza.name.lower() for pizza_id, pizza in self._pizzas.items()
+        }
+        ids_by_name: Dict[str, Dict[str, None]] = defaultdict(dict)
+        for pizza_id, pizza_name in self._name_lower.items():
+            ids_by_name[pizza_name][pizza_id] = None
+        self._ids_by_name = dict(ids_by_name)
+        # Legacy aliases ("fungi", "carnivore", ...) resolve to every size of the pizza
+        # they name; aliases for removed pizzas are dropped
+        self._ids_by_alias = {
+            alias: self._ids_by_name[self._name_lower[pizza_id]]
+            for alias, pizza_id in LEGACY_MENU_MAPPING.items()
+            if pizza_id in self._name_lower
+        }
+        self._ingredients_lower = {
+            pizza_id: [ing.lower() for ing in pizza.ingredients]
+            for pizza_id, pizza in self._pizzas.items()
+        }
+        self._revision += 1
     
     async def get_all(self) -> List[Pizza]:
         """Get all pizzas"""
@@ -30,24 +85,33 @@ class InMemoryPizzaRepository(IPizzaRepository):
     
     async def get_by_category(self, category: PizzaCategory) -> List[Pizza]:
         """Get pizzas by category"""
-        return [pizza for pizza in self._pizzas.values() if pizza.category == category]
+        return [self._pizzas[pizza_id] for pizza_id in self._by_category.get(category, ())]
     
     async def get_by_size(self, size: PizzaSize) -> List[Pizza]:
         """Get pizzas by size"""
-        return [pizza for pizza in self._pizzas.values() if pizza.size == size]
+        return [self._pizzas[pizza_id] for pizza_id in self._by_size.get(size, ())]
+    
+    async def get_by_name(self, name: str) -> List[Pizza]:
+        """Get pizzas whose name matches exactly (case-insensitive), one per size"""
+        return [self._pizzas[pizza_id] for pizza_id in self._ids_by_name.get(name.strip().lower(), ())]
+    
+    async def get_by_alias(self, alias: str) -> List[Pizza]:
+        """Get pizzas whose legacy menu alias matches exactly (case-insensitive), one per size"""
+        return [self._pizzas[pizza_id] for pizza_id in self._ids_by_alias.get(alias.strip().lower(), ())]
     
     async def search_by_name(self, name: str) -> List[Pizza]:
         """Search pizzas by name (fuzzy matching)"""
         name_lower = name.lower()
+        words = name_lower.split()
         matches = []
         
-        for pizza in self._pizzas.values():
+        for pizza_id, pizza_name in self._name_lower.items():
             # Exact name match
-            if name_lower in pizza.name.lower():
-                matches.append(pizza)
+            if name_lower in pizza_name:
+                matches.append(self._pizzas[pizza_id])
             # Word-based matching
-            elif any(word in pizza.name.lower() for word in name_lower.split()):
-                matches.append(pizza)
+            elif any(word in pizza_name for word in words):
+                matches.append(self._pizzas[pizza_id])
         
         return matches
     
@@ -55,17 +119,27 @@ class InMemoryPizzaRepository(IPizzaRepository):
         """Search pizzas by ingredient"""
         ingredient_lower = ingredient.lower()
         return [
-            pizza for pizza in self._pizzas.values()
-            if any(ingredient_lower in ing.lower() for ing in pizza.ingredients)
+            self._pizzas[pizza_id]
+            for pizza_id, ingredients in self._ingredients_lower.items()
+            if any(ingredient_lower in ing for ing in ingredients)
         ]
     
     async def get_available_pizzas(self) -> List[Pizza]:
         """Get only available pizzas"""
-        return [pizza for pizza in self._pizzas.values() if pizza.is_available]
+        return [self._pizzas[pizza_id] for pizza_id in self._available]
+    
+    async def count_available(self) -> int:
+        """Count available pizzas"""
+        return len(self._available)
+    
+    async def get_available_by_category(self, category: PizzaCategory) -> List[Pizza]:
+        """Get available pizzas in a category"""
+        return [self._pizzas[pizza_id] for pizza_id in self._available_by_category.get(category, ())]
     
     async def add(self, pizza: Pizza) -> Pizza:
         """Add a new pizza"""
         self._pizzas[pizza.id] = pizza
+        self._reindex()
         return pizza
     
     async def update(self, pizza: Pizza) -> Pizza:
@@ -73,12 +147,14 @@ class InMemoryPizzaRepository(IPizzaRepository):
         if pizza.id not in self._pizzas:
             raise ValueError(f"Pizza with ID {pizza.id} not found")
         self._pizzas[pizza.id] = pizza
+        self._reindex()
         return pizza
     
     async def delete(self, pizza_id: str) -> bool:
         """Delete pizza by ID"""
         if pizza_id in self._pizzas:
             del self._pizzas[pizza_id]
+            self._reindex()
             return True
         return False
     
@@ -86,8 +162,13 @@ class InMemoryPizzaRepository(IPizzaRepository):
         """Set pizza availability"""
         if pizza_id in self._pizzas:
             self._pizzas[pizza_id].is_available = is_available
+            self._reindex()
             return True
         return False
+    
+    async def get_revision(self) -> int:
+        """Get a counter that changes whenever the menu is mutated"""
+        return self._revision
 
 
 class InMemoryOrderRepository(IOrderRepository):
@@ -95,10 +176,85 @@ class InMemoryOrderRepository(IOrderRepository):
     
     def __init__(self):
         self._orders: Dict[str, Order] = {}
+        # Status membership indexes; dicts are used as insertion-ordered sets
+        self._ids_by_status: Dict[OrderStatus, Dict[str, None]] = defaultdict(dict)
+        self._status_by_id: Dict[str, OrderStatus] = {}
+        self._active_ids: Dict[str, None] = {}
+        # (created_at, order_id) pairs kept sorted for recency and date-range queries
+        self._by_created: List[Tuple[datetime, str]] = []
+        self._created_key_by_id: Dict[str, Tuple[datetime, str]] = {}
+        # Order IDs per lowercased customer email, and each order's lowercased email
+        self._ids_by_email: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._email_lower_by_id: Dict[str, str] = {}
+    
+    def _index_email(self, order: Order):
+        """Move an order into the bucket for its customer's email"""
+        email_lower = order.customer.email.lower()
+        previous = self._email_lower_by_id.get(order.id)
+        if previous == email_lower:
+            return
+        
+        if previous is not None:
+            self._unindex_email(order.id)
+        self._ids_by_email[email_lower][order.id] = None
+        self._email_lower_by_id[order.id] = email_lower
+    
+    def _unindex_email(self, order_id: str):
+        """Remove an order from the email index"""
+        email_lower = self._email_lower_by_id.pop(order_id, None)
+        customer_ids = self._ids_by_email.get(email_lower)
+        if customer_ids is not None:
+            customer_ids.pop(order_id, None)
+            if not customer_ids:
+                del self._ids_by_email[email_lower]
+    
+    def _index_status(self, order: Order):
+        """Move an order into the index buckets for its current status"""
+        previous = self._status_by_id.get(order.id)
+        if previous is order.status:
+            return
+        
+        if previous is not None:
+            self._ids_by_status[previous].pop(order.id, None)
+        self._ids_by_status[order.status][order.id] = None
+        self._status_by_id[order.id] = order.status
+        
+        if order.is_active:
+            self._active_ids.setdefault(order.id)
+        else:
+            self._active_ids.pop(order.id, None)
+    
+    def _index_created(self, order: Order):
+        """Place an order in the creation-time index"""
+        key = (order.created_at, order.id)
+        previous = self._created_key_by_id.get(order.id)
+        if previous == key:
+            return
+        
+        if previous is not None:
+            self._remove_created_key(previous)
+        insort(self._by_created, key)
+        self._created_key_by_id[order.id] = key
+    
+    def _remove_created_key(self, key: Tuple[datetime, str]):
+        """Remove a key from the creation-time index"""
+        position = bisect_left(self._by_created, key)
+        if position < len(self._by_created) and self._by_created[position] == key:
+            del self._by_created[position]
+    
+    def _unindex_status(self, order_id: str):
+        """Remove an order from the status indexes"""
+        previous = self._status_by_id.pop(order_id, None)
+        if previous is not None:
+            self._ids_by_status[previous].pop(order_id, None)
+        self._active_ids.pop(order_id, None)
     
     async def save(self, order: Order) -> Order:
         """Save an order (create or update)"""
         self._orders[order.id] = order
+        self._index_email(order)
+        self._index_status(order)
+        self._index_created(order)
         return order
     
     async def get_by_id(self, order_id: str) -> Optional[Order]:
@@ -107,40 +263,35 @@ class InMemoryOrderRepository(IOrderRepository):
     
     async def get_by_customer_email(self, email: str) -> List[Order]:
         """Get all orders for a customer by email"""
-        email_lower = email.lower()
-        return [
-            order for order in self._orders.values()
-            if order.customer.email.lower() == email_lower
-        ]
+        return [self._orders[order_id] for order_id in self._ids_by_email.get(email.lower(), ())]
     
     async def get_active_orders(self) -> List[Order]:
         """Get all active orders (not delivered or cancelled)"""
-        return [order for order in self._orders.values() if order.is_active]
+        return [self._orders[order_id] for order_id in self._active_ids]
     
     async def get_by_status(self, status: OrderStatus) -> List[Order]:
         """Get orders by status"""
-        return [order for order in self._orders.values() if order.status == status]
+        return [self._orders[order_id] for order_id in self._ids_by_status.get(status, ())]
     
     async def get_recent_orders(self, limit: int = 10) -> List[Order]:
         """Get recent orders"""
-        sorted_orders = sorted(
-            self._orders.values(),
-            key=lambda o: o.created_at,
-            reverse=True
-        )
-        return sorted_orders[:limit]
+        if limit > 0:
+            return [self._orders[order_id] for _, order_id in reversed(self._by_created[-limit:])]
+        # Other limits slice the newest-first list as given (-1 drops the oldest order)
+        return [self._orders[order_id] for _, order_id in reversed(self._by_created)][:limit]
     
     async def get_orders_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Order]:
         """Get orders within date range"""
-        return [
-            order for order in self._orders.values()
-            if start_date <= order.created_at <= end_date
-        ]
+        start = bisect_left(self._by_created, start_date, key=itemgetter(0))
+        end = bisect_right(self._by_created, end_date, key=itemgetter(0))
+        return [self._orders[order_id] for _, order_id in self._by_created[start:end]]
     
     async def update_status(self, order_id: str, status: OrderStatus) -> bool:
         """Update order status"""
         if order_id in self._orders:
-            self._orders[order_id].update_status(status)
+            order = self._orders[order_id]
+            order.update_status(status)
+            self._index_status(order)
             return True
         return False
     
@@ -148,16 +299,32 @@ class InMemoryOrderRepository(IOrderRepository):
         """Delete order by ID"""
         if order_id in self._orders:
             del self._orders[order_id]
+            self._unindex_email(order_id)
+            self._unindex_status(order_id)
+            created_key = self._created_key_by_id.pop(order_id, None)
+            if created_key is not None:
+                self._remove_created_key(created_key)
             return True
         return False
     
     async def get_customer_order_count(self, email: str) -> int:
         """Get total order count for a customer"""
-        email_lower = email.lower()
-        return len([
-            order for order in self._orders.values()
-            if order.customer.email.lower() == email_lower
-        ])
+        return len(self._ids_by_email.get(email.lower(), ()))
+    
+    async def customer_has_orders(self, email: str) -> bool:
+        """Check if a customer has placed at least one order"""
+        return bool(self._ids_by_email.get(email.lower()))
+    
+    async def get_recent_pizza_ids_by_email(self, email: str, limit: int = 20) -> List[str]:
+        """Get distinct pizza IDs from a customer's most recent orders, newest first"""
+        customer_orders = await self.get_by_customer_email(email)
+        customer_orders.sort(key=lambda o: o.created_at, reverse=True)
+        
+        pizza_ids: Dict[str, None] = {}
+        for order in customer_orders[:limit]:
+            for item in order.items:
+                pizza_ids.setdefault(item.pizza.id)
+        return list(pizza_ids)
 
 
 class InMemoryUserRepository(IUserRepository):
@@ -165,18 +332,40 @@ class InMemoryUserRepository(IUserRepository):
     
     def __init__(self):
         self._users: Dict[str, User] = {}
+        self._by_id: Dict[str, User] = {}
+        # Email key each user was stored under, so deletes never depend on the current email
+        self._email_lower_by_id: Dict[str, str] = {}
     
     async def save(self, user: User) -> User:
         """Save a user (create or update)"""
-        self._users[user.email.lower()] = user
+        email_lower = user.email.lower()
+        previous = self._email_lower_by_id.get(user.id)
+        if previous is not None and previous != email_lower:
+            self._users.pop(previous, None)
+        
+        # A different user already stored under this email is replaced; drop its ID entries too
+        displaced = self._users.get(email_lower)
+        if displaced is not None and displaced.id != user.id:
+            self._by_id.pop(displaced.id, None)
+            self._email_lower_by_id.pop(displaced.id, None)
+        
+        self._users[email_lower] = user
+        self._by_id[user.id] = user
+        self._email_lower_by_id[user.id] = email_lower
         return user
     
+    async def upsert(self, email: str, name: str) -> Tuple[User, bool]:
+        """Create a user or update the name of an existing one; returns (user, created)"""
+        user = self._users.get(email.lower())
+        if user:
+            user.update_profile(name=name)
+            return user, False
+        
+        return await self.save(User(email=email, name=name)), True
+    
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        for user in self._users.values():
-            if user.id == user_id:
-                return user
-        return None
+        return self._by_id.get(user_id)
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -204,29 +393,24 @@ class InMemoryUserRepository(IUserRepository):
     
     async def update_order_count(self, user_id: str) -> bool:
         """Increment user's order count"""
-        for user in self._users.values():
-            if user.id == user_id:
-                user.record_order()
-                return True
+        user = self._by_id.get(user_id)
+        if user:
+            user.record_order()
+            return True
         return False
     
     async def deactivate(self, user_id: str) -> bool:
         """Deactivate user account"""
-        for user in self._users.values():
-            if user.id == user_id:
-                user.deactivate()
-                return True
+        user = self._by_id.get(user_id)
+        if user:
+            user.deactivate()
+            return True
         return False
     
     async def delete(self, user_id: str) -> bool:
         """Delete user by ID"""
-        email_to_delete = None
-        for email, user in self._users.items():
-            if user.id == user_id:
-                email_to_delete = email
-                break
-        
-        if email_to_delete:
-            del self._users[email_to_delete]
-            return True
-        return False 
\ No newline at end of file
+        if self._by_id.pop(user_id, None) is None:
+            return False
+        self._users.pop(self._email_lower_by_id.pop(user_id), None)
+        return True
+ 
\ No newline at end of file
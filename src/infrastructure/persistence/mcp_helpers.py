@@ -1,5 +1,19 @@
 """Helper utilities for MCP server operations"""
 
+import re
+import uuid
+
+_EMAIL_RE = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+
+# Tried in order, so an explicit MCP-ORD- ID wins over a bare number elsewhere in the message
+_ORDER_ID_PATTERNS = (
+    re.compile(r'(MCP-ORD-[\w\d]+)', re.IGNORECASE),  # Standard format
+    re.compile(r'order\s+(\w+)', re.IGNORECASE),      # "track order 123"
+    re.compile(r'#(\w+)', re.IGNORECASE),             # "track #123"
+    re.compile(r'\b(\d{3,8})\b')                      # Any 3-8 digit number
+)
+
+
 def sanitize_message(message: str) -> str:
     """Sanitize user message for processing"""
     return message.strip()
@@ -14,32 +28,20 @@ def format_price(price: float) -> str:
 
 def create_order_id() -> str:
     """Generate a unique order ID"""
-    import uuid
     return f"MCP-ORD-{str(uuid.uuid4())[:8]}"
 
 def create_user_id() -> str:
     """Generate a unique user ID"""
-    import uuid
     return str(uuid.uuid4())
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    import re
-    email_regex = r'^[^\s@]+@[^\s@]+\.[^\s@]+$'
-    return re.match(email_regex, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def extract_order_id_from_message(message: str) -> str:
     """Extract order ID from user message"""
-    import re
-    order_id_patterns = [
-        r'(MCP-ORD-[\w\d]+)',  # Standard format
-        r'order\s+(\w+)',      # "track order 123"
-        r'#(\w+)',             # "track #123"
-        r'\b(\d{3,8})\b'       # Any 3-8 digit number
-    ]
-    
-    for pattern in order_id_patterns:
-        match = re.search(pattern, message, re.IGNORECASE)
+    for pattern in _ORDER_ID_PATTERNS:
+        match = pattern.search(message)
         if match:
             extracted_id = match.group(1)
             # If it's just a number, format it as MCP order
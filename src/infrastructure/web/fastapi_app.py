@@ -6,18 +6,29 @@ Clean architecture implementation of the web API using dependency injection.
 
 import sys
 import os
-from typing import Dict, Any, Optional, List
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable, AsyncIterator
 from contextlib import asynccontextmanager
 
+import orjson
+
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from ..di_container import container
-from ...application.use_cases.order_use_cases import OrderRequest
+from ...application.interfaces import ILLMService
+from ...application.use_cases.order_use_cases import OrderRequest, OrderUseCases
+
+
+logger = logging.getLogger(__name__)
 
 
 # Pydantic models for API
@@ -50,6 +61,113 @@ class OrderResponse(BaseModel):
     error: Optional[str] = None
 
 
+# Result of a chat intent handler: (response message, context additions, tool used)
+HandlerResult = Tuple[str, Dict[str, Any], Optional[str]]
+
+
+def _etag(body: bytes) -> str:
+    """Weak ETag for a response body
+    
+    Weak because GZipMiddleware may serve the same tag with either the identity or
+    the gzip encoding, which are not byte-for-byte equal.
+    """
+    return 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Encode a response model with orjson instead of FastAPI's stdlib JSON path"""
+    return Response(content=orjson.dumps(model.model_dump()), media_type="application/json")
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the body with this ETag (weak comparison)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag == "*" or tag.removeprefix("W/") == opaque
+        for tag in (tag.strip() for tag in if_none_match.split(","))
+    )
+
+
+# Static parts of the / and /health responses, built once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "🍕 Pizza AI - Clean Architecture API",
+    "description": "Modern pizza ordering system built with Clean Architecture principles",
+    "architecture": {
+        "pattern": "Clean Architecture",
+        "layers": ["Domain", "Application", "Infrastructure"],
+        "principles": ["Dependency Inversion", "Single Responsibility", "Interface Segregation"]
+    },
+    "endpoints": {
+        "chat": "POST /chat - Natural language pizza ordering",
+        "menu": "GET /menu?category={all|veg|non-veg} - Get menu",
+        "order": "POST /order - Place structured order",
+        "track": "GET /order/{order_id} - Track order",
+        "health": "GET /health - Health check"
+    },
+    "version": "2.0.0"
+})
+_ROOT_ETAG = _etag(_ROOT_BODY)
+
+_HEALTH_INFO = {
+    "status": "healthy",
+    "message": "Pizza AI Clean Architecture API is running",
+    "architecture": "Clean Architecture with Dependency Injection",
+    "llm_integration": "Groq Llama 3.1 7B",
+    "version": "2.0.0"
+}
+
+
+# Chat prompt and message templates
+MENU_PROMPT = "Generate a friendly message about showing the {category} pizza menu"
+PIZZA_FOUND_MESSAGE = "🍕 Great! I found {name} for {price}. {description} Would you like to order this?"
+
+
+# Encoded /menu bodies: category -> (use case result they were built from, JSON bytes, ETag).
+# The use case returns the same result object until the menu changes, so an
+# identity check is enough to know the bytes are still current.
+_menu_payloads: Dict[str, Tuple[Dict[str, Any], bytes, str]] = {}
+_MENU_PAYLOAD_LIMIT = 16
+
+
+def _encode_menu(category: str, result: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Get the JSON body and ETag for a menu result, encoding it only when it changed"""
+    cached = _menu_payloads.get(category)
+    if cached and cached[0] is result:
+        return cached[1], cached[2]
+    
+    body = orjson.dumps(MenuResponse(
+        success=result["success"],
+        category=result["category"],
+        items=result["items"],
+        total_items=result["total_items"]
+    ).model_dump())
+    etag = _etag(body)
+    if category in _menu_payloads or len(_menu_payloads) < _MENU_PAYLOAD_LIMIT:
+        _menu_payloads[category] = (result, body, etag)
+    return body, etag
+
+
+# Routes ending in this suffix stream server-sent events
+_SSE_PATH_SUFFIX = "/stream"
+
+
+class _StreamSafeGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves server-sent event routes uncompressed
+    
+    Older Starlette releases buffer and compress text/event-stream bodies, which
+    holds tokens back until the stream ends, so the SSE routes bypass it by path.
+    """
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith(_SSE_PATH_SUFFIX):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 # FastAPI app with lifespan management
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -58,10 +176,18 @@ async def lifespan(app: FastAPI):
     print("🏗️ Using Clean Architecture with Dependency Injection")
     print("🧠 LLM: Groq Integration")
     
+    # Resolve dependencies once; endpoints read them from app.state
+    app.state.llm_service = container.get_llm_service()
+    app.state.order_use_cases = container.get_order_use_cases()
+    app.state.pizza_repository = container.get_pizza_repository()
+    app.state.order_repository = container.get_order_repository()
+    app.state.user_repository = container.get_user_repository()
+    
     yield
     
     # Shutdown
     print("🛑 Shutting down Pizza AI FastAPI Server...")
+    await app.state.llm_service.aclose()
 
 
 app = FastAPI(
@@ -80,14 +206,129 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies such as the menu; small replies aren't worth the CPU
+app.add_middleware(_StreamSafeGZipMiddleware, minimum_size=512, compresslevel=4)
+
+
+# --- CHAT INTENT HANDLERS ---
+# Each handler returns (response message, response context additions, tool used).
+
+async def _handle_get_menu(request: ChatRequest, llm_service: ILLMService, order_use_cases: OrderUseCases,
+                           parameters: Dict[str, Any], context: Dict[str, Any]) -> HandlerResult:
+    category = parameters.get("category", "all")
+    
+    # The friendly message only depends on the category, so generate it while the menu loads
+    result, message = await asyncio.gather(
+        order_use_cases.get_menu(category),
+        llm_service.generate_response(MENU_PROMPT.format(category=category))
+    )
+    
+    if not result["success"]:
+        message = await llm_service.generate_error_message(result.get("error", "Menu unavailable"), context)
+        return message, {}, "get_menu"
+    
+    return message, {"menu_items": result["items"]}, "get_menu"
+
+
+async def _handle_find_pizza(request: ChatRequest, llm_service: ILLMService, order_use_cases: OrderUseCases,
+                             parameters: Dict[str, Any], context: Dict[str, Any]) -> HandlerResult:
+    name = parameters.get("name", "")
+    size = parameters.get("size", "large")
+    
+    if not name:
+        return "What pizza are you looking for? I can help you find it!", {}, None
+    
+    result = await order_use_cases.find_pizza(name, size)
+    
+    if not result["success"]:
+        message = await llm_service.generate_error_message(result.get("error", "Pizza not found"), context)
+        return message, {}, "find_pizza"
+    
+    pizza = result["pizza"]
+    message = PIZZA_FOUND_MESSAGE.format(name=pizza["name"], price=pizza["price"], description=pizza["description"])
+    return message, {"pizza_found": pizza}, "find_pizza"
+
+
+async def _handle_place_order(request: ChatRequest, llm_service: ILLMService, order_use_cases: OrderUseCases,
+                              parameters: Dict[str, Any], context: Dict[str, Any]) -> HandlerResult:
+    # For full order placement, we need more structured data
+    if not request.user_email or not request.user_name:
+        return "To place an order, I'll need your email and name. Could you provide those?", {}, None
+    
+    # This is a simplified order - in real implementation, 
+    # would need more sophisticated parameter extraction
+    items = parameters.get("items", ["margherita"])
+    
+    try:
+        order_request = OrderRequest(
+            customer_name=request.user_name,
+            customer_email=request.user_email,
+            customer_phone="555-0123",  # Default for demo
+            customer_address="123 Main Street",  # Default for demo
+            items=items
+        )
+        
+        result = await order_use_cases.place_order(order_request)
+        
+        if result.success:
+            return result.message, {"order": result.order_details}, "place_order"
+        
+        message = await llm_service.generate_error_message(result.error or "Order failed", context)
+        return message, {}, "place_order"
+    except Exception:
+        return "I need a bit more information to place your order. What pizza would you like?", {}, None
+
+
+async def _handle_track_order(request: ChatRequest, llm_service: ILLMService, order_use_cases: OrderUseCases,
+                              parameters: Dict[str, Any], context: Dict[str, Any]) -> HandlerResult:
+    order_id = parameters.get("order_id")
+    result = await order_use_cases.track_order(order_id, request.user_email)
+    
+    if result.success:
+        return result.message, {"order_status": result.order_details}, "track_order"
+    
+    message = await llm_service.generate_error_message(result.error or "Order not found", context)
+    return message, {}, "track_order"
+
+
+async def _handle_get_suggestions(request: ChatRequest, llm_service: ILLMService, order_use_cases: OrderUseCases,
+                                  parameters: Dict[str, Any], context: Dict[str, Any]) -> HandlerResult:
+    preferences = parameters.get("preferences", "popular")
+    result = await order_use_cases.get_suggestions(request.user_email, preferences)
+    
+    if result["success"]:
+        return result["message"], {"suggestions": result["suggestions"]}, "get_suggestions"
+    
+    message = await llm_service.generate_error_message(result.get("error", "No suggestions available"), context)
+    return message, {}, "get_suggestions"
+
+
+async def _handle_general_chat(request: ChatRequest, llm_service: ILLMService, order_use_cases: OrderUseCases,
+                               parameters: Dict[str, Any], context: Dict[str, Any]) -> HandlerResult:
+    message = await llm_service.generate_welcome_message(
+        request.user_name, 
+        is_new_user=True  # Could check this via user repository
+    )
+    return message, {}, None
+
+
+INTENT_HANDLERS: Dict[str, Callable[..., Awaitable[HandlerResult]]] = {
+    "get_menu": _handle_get_menu,
+    "find_pizza": _handle_find_pizza,
+    "place_order": _handle_place_order,
+    "track_order": _handle_track_order,
+    "get_suggestions": _handle_get_suggestions,
+    "general_chat": _handle_general_chat,
+}
+
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest):
+async def chat_endpoint(request: ChatRequest, http_request: Request):
     """Main chat endpoint - handles natural language pizza ordering"""
     try:
-        # Get dependencies from container
-        llm_service = container.get_llm_service()
-        order_use_cases = container.get_order_use_cases()
+        state = http_request.app.state
+        llm_service = state.llm_service
+        order_use_cases = state.order_use_cases
         
         # Parse user intent using LLM
         context = {
@@ -97,164 +338,74 @@ async def chat_endpoint(request: ChatRequest):
         }
         
         intent_data = await llm_service.parse_user_intent(request.message, context)
+        
         intent = intent_data.get("intent", "general_chat")
         parameters = intent_data.get("parameters", {})
         
-        tools_used = []
-        response_message = ""
-        response_context = {"intent": intent}
-        
         # Route based on intent
-        if intent == "get_menu":
-            category = parameters.get("category", "all")
-            result = await order_use_cases.get_menu(category)
-            tools_used.append("get_menu")
-            
-            if result["success"]:
-                response_message = await llm_service.generate_response(
-                    f"Generate a friendly message about showing the {category} pizza menu with {result['total_items']} items"
-                )
-                response_context["menu_items"] = result["items"]
-            else:
-                response_message = await llm_service.generate_error_message(
-                    result.get("error", "Menu unavailable"), context
-                )
-        
-        elif intent == "find_pizza":
-            name = parameters.get("name", "")
-            size = parameters.get("size", "large")
-            
-            if not name:
-                response_message = "What pizza are you looking for? I can help you find it!"
-            else:
-                result = await order_use_cases.find_pizza(name, size)
-                tools_used.append("find_pizza")
-                
-                if result["success"]:
-                    pizza = result["pizza"]
-                    response_message = f"🍕 Great! I found {pizza['name']} for {pizza['price']}. {pizza['description']} Would you like to order this?"
-                    response_context["pizza_found"] = pizza
-                else:
-                    response_message = await llm_service.generate_error_message(
-                        result.get("error", "Pizza not found"), context
-                    )
-        
-        elif intent == "place_order":
-            # For full order placement, we need more structured data
-            if not request.user_email or not request.user_name:
-                response_message = "To place an order, I'll need your email and name. Could you provide those?"
-            else:
-                # This is a simplified order - in real implementation, 
-                # would need more sophisticated parameter extraction
-                items = parameters.get("items", ["margherita"])
-                
-                try:
-                    order_request = OrderRequest(
-                        customer_name=request.user_name,
-                        customer_email=request.user_email,
-                        customer_phone="555-0123",  # Default for demo
-                        customer_address="123 Main Street",  # Default for demo
-                        items=items
-                    )
-                    
-                    result = await order_use_cases.place_order(order_request)
-                    tools_used.append("place_order")
-                    
-                    if result.success:
-                        response_message = result.message
-                        response_context["order"] = result.order_details
-                    else:
-                        response_message = await llm_service.generate_error_message(
-                            result.error or "Order failed", context
-                        )
-                except Exception as e:
-                    response_message = f"I need a bit more information to place your order. What pizza would you like?"
-        
-        elif intent == "track_order":
-            order_id = parameters.get("order_id")
-            result = await order_use_cases.track_order(order_id, request.user_email)
-            tools_used.append("track_order")
-            
-            if result.success:
-                response_message = result.message
-                response_context["order_status"] = result.order_details
-            else:
-                response_message = await llm_service.generate_error_message(
-                    result.error or "Order not found", context
-                )
-        
-        elif intent == "get_suggestions":
-            preferences = parameters.get("preferences", "popular")
-            result = await order_use_cases.get_suggestions(request.user_email, preferences)
-            tools_used.append("get_suggestions")
-            
-            if result["success"]:
-                response_message = result["message"]
-                response_context["suggestions"] = result["suggestions"]
-            else:
-                response_message = await llm_service.generate_error_message(
-                    result.get("error", "No suggestions available"), context
-                )
-        
-        else:  # general_chat
-            response_message = await llm_service.generate_welcome_message(
-                request.user_name, 
-                is_new_user=True  # Could check this via user repository
-            )
+        handler = INTENT_HANDLERS.get(intent, _handle_general_chat)
+        response_message, context_updates, tool_used = await handler(
+            request, llm_service, order_use_cases, parameters, context
+        )
         
-        return ChatResponse(
+        return _json_response(ChatResponse(
             response=response_message,
             intent=intent,
-            tools_used=tools_used,
-            context=response_context
-        )
+            tools_used=[tool_used] if tool_used else [],
+            context={"intent": intent, **context_updates}
+        ))
         
     except Exception as e:
-        print(f"❌ Chat endpoint error: {e}")
+        logger.error("❌ Chat endpoint error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/menu", response_model=MenuResponse)
-async def get_menu_endpoint(category: str = "all"):
+async def get_menu_endpoint(http_request: Request, category: str = "all"):
     """Get pizza menu by category"""
     try:
-        order_use_cases = container.get_order_use_cases()
-        result = await order_use_cases.get_menu(category)
+        result = await http_request.app.state.order_use_cases.get_menu(category)
         
-        return MenuResponse(
-            success=result["success"],
-            category=result["category"],
-            items=result["items"],
-            total_items=result["total_items"]
-        )
+        if not result["success"]:
+            # Failed lookups are reported in the body and never cached or tagged
+            return MenuResponse(
+                success=False,
+                category=result.get("category", category),
+                items=result.get("items", []),
+                total_items=result.get("total_items", 0)
+            )
+        
+        body, etag = _encode_menu(category, result)
+        if _is_not_modified(http_request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/order", response_model=OrderResponse)
-async def place_order_endpoint(request: OrderRequest):
+async def place_order_endpoint(request: OrderRequest, http_request: Request):
     """Place a direct order"""
     try:
-        order_use_cases = container.get_order_use_cases()
-        result = await order_use_cases.place_order(request)
+        result = await http_request.app.state.order_use_cases.place_order(request)
         
-        return OrderResponse(
+        return _json_response(OrderResponse(
             success=result.success,
             order_id=result.order_id,
             message=result.message,
             order_details=result.order_details,
             error=result.error
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/order/{order_id}")
-async def track_order_endpoint(order_id: str):
+async def track_order_endpoint(order_id: str, http_request: Request):
     """Track order by ID"""
     try:
-        order_use_cases = container.get_order_use_cases()
-        result = await order_use_cases.track_order(order_id)
+        result = await http_request.app.state.order_use_cases.track_order(order_id)
         
         return {
             "success": result.success,
@@ -267,52 +418,74 @@ async def track_order_endpoint(order_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _sse(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Frame text chunks as server-sent events, ending with a done event"""
+    async for chunk in chunks:
+        # JSON-encode each chunk so newlines in the text can't break the event framing
+        yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+    yield b"event: done\ndata: {}\n\n"
+
+
+def _sse_response(chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Streaming response that forwards LLM tokens as they are generated"""
+    return StreamingResponse(_sse(chunks), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/welcome/stream")
+async def stream_welcome_endpoint(http_request: Request, user_name: Optional[str] = None,
+                                  is_new_user: bool = False):
+    """Stream a welcome message as server-sent events"""
+    llm_service = http_request.app.state.llm_service
+    return _sse_response(llm_service.stream_welcome_message(user_name, is_new_user))
+
+
+@app.get("/order/{order_id}/confirmation/stream")
+async def stream_order_confirmation_endpoint(order_id: str, http_request: Request):
+    """Stream the confirmation message for a placed order as server-sent events"""
+    order = await http_request.app.state.order_repository.get_by_id(order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    llm_service = http_request.app.state.llm_service
+    return _sse_response(llm_service.stream_order_confirmation_message(order))
+
+
 @app.get("/health")
-async def health_check():
+async def health_check(http_request: Request):
     """Health check endpoint"""
     try:
         # Test that our dependencies are working
-        pizza_repo = container.get_pizza_repository()
-        pizzas = await pizza_repo.get_available_pizzas()
+        pizza_repo = http_request.app.state.pizza_repository
+        available_pizzas = await pizza_repo.count_available()
         
-        return {
-            "status": "healthy",
-            "message": "Pizza AI Clean Architecture API is running",
-            "architecture": "Clean Architecture with Dependency Injection",
-            "available_pizzas": len(pizzas),
-            "llm_integration": "Groq Llama 3.1 7B",
-            "version": "2.0.0"
-        }
+        return {**_HEALTH_INFO, "available_pizzas": available_pizzas}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {e}")
 
 
 @app.get("/")
-async def root():
+async def root(http_request: Request):
     """Root endpoint with API information"""
-    return {
-        "message": "🍕 Pizza AI - Clean Architecture API",
-        "description": "Modern pizza ordering system built with Clean Architecture principles",
-        "architecture": {
-            "pattern": "Clean Architecture",
-            "layers": ["Domain", "Application", "Infrastructure"],
-            "principles": ["Dependency Inversion", "Single Responsibility", "Interface Segregation"]
-        },
-        "endpoints": {
-            "chat": "POST /chat - Natural language pizza ordering",
-            "menu": "GET /menu?category={all|veg|non-veg} - Get menu",
-            "order": "POST /order - Place structured order",
-            "track": "GET /order/{order_id} - Track order",
-            "health": "GET /health - Health check"
-        },
-        "version": "2.0.0"
-    }
+    if _is_not_modified(http_request, _ROOT_ETAG):
+        return Response(status_code=304, headers={"ETag": _ROOT_ETAG})
+    
+    return Response(content=_ROOT_BODY, media_type="application/json", headers={"ETag": _ROOT_ETAG})
 
 
 if __name__ == "__main__":
     import uvicorn
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     print("🍕 Starting Pizza AI Clean Architecture FastAPI Server...")
     print("🌐 API will be available at: http://localhost:8001")
     print("🏗️ Built with Clean Architecture principles")
     print("🧠 Powered by: Groq LLM + Domain-Driven Design")
-    uvicorn.run(app, host="0.0.0.0", port=8001) 
\ No newline at end of file
+    # uvloop and httptools ship with uvicorn[standard]; uvloop has no Windows build.
+    # Single process on purpose: the in-memory repositories can't be shared across workers.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning"
+    ) 
\ No newline at end of file
@@ -5,13 +5,17 @@ Clean architecture implementation of Model Context Protocol server.
 """
 
 import asyncio
-import json
+import logging
 import sys
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Callable, Awaitable, Union
+
+import orjson
 
 # Add project root to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from mcp.server import Server
 from mcp.types import (
@@ -27,36 +31,184 @@ from mcp.server.stdio import stdio_server
 
 from ..di_container import container
 from ...application.use_cases.order_use_cases import OrderRequest
-from ...domain.entities import PizzaCategory
+from ...domain.entities import Order, Pizza, PizzaCategory, User
 
 
 # Create MCP server instance
 server = Server("pizza-ai-clean-architecture")
 
 
+# MCP_MINIMAL=1 drops the descriptive "architecture" field from every response
+_MINIMAL = os.getenv("MCP_MINIMAL", "0") == "1"
+
+# Responses are compact JSON on the wire; MCP_PRETTY indents them for debugging
+_DUMP_OPTIONS = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if os.getenv("MCP_PRETTY") else 0)
+
+
+def _architecture(label: str) -> Dict[str, str]:
+    """Response fragment naming the architecture layer behind a payload"""
+    return {} if _MINIMAL else {"architecture": label}
+
+
+_ARCH_DOMAIN_ENTITIES = _architecture("Clean Architecture with Domain Entities")
+_ARCH_DOMAIN_AGGREGATES = _architecture("Clean Architecture with Domain Aggregates")
+_ARCH_AGGREGATED_RESOURCES = _architecture("Clean Architecture - Aggregated Resources")
+_ARCH_USE_CASES = _architecture("Clean Architecture - Application Use Cases")
+_ARCH_ENTITY_SEARCH = _architecture("Clean Architecture - Domain Entity Search")
+_ARCH_ORDER_USE_CASES = _architecture("Clean Architecture - Domain Aggregates & Use Cases")
+_ARCH_ORDER_AGGREGATE = _architecture("Clean Architecture - Order Aggregate")
+_ARCH_USER_ENTITY = _architecture("Clean Architecture - User Entity")
+_ARCH_USER_REPOSITORY = _architecture("Clean Architecture - User Entity & Repository")
+_ARCH_DOMAIN_SERVICE = _architecture("Clean Architecture - Domain Service Logic")
+_ARCH_ERROR_HANDLING = _architecture("Clean Architecture - Error Handling")
+
+
+def _dump(payload: Dict[str, Any]) -> str:
+    """Serialize a payload as JSON text (datetimes become ISO 8601)
+    
+    Domain entities can be placed in the payload as-is; orjson hands them to
+    ``_encode`` instead of serializing their dataclass fields.
+    """
+    return orjson.dumps(payload, default=_encode, option=_DUMP_OPTIONS).decode()
+
+
 # --- RESOURCES ---
+# Resource listing is static, so it is built once at import
+_RESOURCES_RESULT = ListResourcesResult(
+    resources=[
+        Resource(
+            uri="memory://menu",
+            name="Pizza Menu",
+            description="Complete pizza menu with all available items using domain entities",
+            mimeType="application/json"
+        ),
+        Resource(
+            uri="memory://orders",
+            name="Order History", 
+            description="All pizza orders placed through the clean architecture system",
+            mimeType="application/json"
+        ),
+        Resource(
+            uri="memory://users",
+            name="User Database",
+            description="User information managed by domain entities",
+            mimeType="application/json"
+        ),
+        Resource(
+            uri="memory://all",
+            name="Dashboard Snapshot",
+            description="Menu, recent orders and active users fetched together",
+            mimeType="application/json"
+        )
+    ]
+)
+
+
 @server.list_resources()
 async def list_resources() -> ListResourcesResult:
     """List available resources"""
-    return ListResourcesResult(
-        resources=[
-            Resource(
-                uri="memory://menu",
-                name="Pizza Menu",
-                description="Complete pizza menu with all available items using domain entities",
-                mimeType="application/json"
-            ),
-            Resource(
-                uri="memory://orders",
-                name="Order History", 
-                description="All pizza orders placed through the clean architecture system",
-                mimeType="application/json"
-            ),
-            Resource(
-                uri="memory://users",
-                name="User Database",
-                description="User information managed by domain entities",
-                mimeType="application/json"
+    return _RESOURCES_RESULT
+
+
+def _pizza_row(pizza: Pizza) -> Dict[str, Any]:
+    """Menu resource entry for a pizza"""
+    return {
+        "id": pizza.id,
+        "name": pizza.display_name,
+        "price": pizza.formatted_price,
+        "category": pizza.category.value,
+        "description": pizza.description,
+        "ingredients": pizza.ingredients,
+        "available": pizza.is_available
+    }
+
+
+def _order_row(order: Order) -> Dict[str, Any]:
+    """Orders resource entry for an order"""
+    return {
+        "order_id": order.id,
+        "customer_email": order.customer.email,
+        "customer_name": order.customer.name,
+        "status": order.status.value,
+        "total_amount": order.formatted_total,
+        "items_count": order.total_items,
+        "created_at": order.created_at,
+        "estimated_eta": order.estimated_eta
+    }
+
+
+def _user_row(user: User) -> Dict[str, Any]:
+    """Users resource entry for a user"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.display_name,
+        "total_orders": user.total_orders,
+        "is_frequent_customer": user.is_frequent_customer,
+        "created_at": user.created_at
+    }
+
+
+# Entity type -> resource row builder, used by orjson for values it can't encode itself
+_ROW_ENCODERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    Pizza: _pizza_row,
+    Order: _order_row,
+    User: _user_row,
+}
+
+
+def _encode(obj: Any) -> Dict[str, Any]:
+    """orjson default hook for domain entities"""
+    encoder = _ROW_ENCODERS.get(type(obj))
+    if encoder is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return encoder(obj)
+
+
+def _menu_payload(pizzas: List[Pizza]) -> Dict[str, Any]:
+    """Build the menu resource payload"""
+    return {
+        "menu": pizzas,
+        "categories": ["all", "veg", "non-veg"],
+        "total_items": len(pizzas),
+        **_ARCH_DOMAIN_ENTITIES
+    }
+
+
+def _orders_payload(orders: List[Order]) -> Dict[str, Any]:
+    """Build the orders resource payload"""
+    return {
+        "orders": orders,
+        "total_orders": len(orders),
+        **_ARCH_DOMAIN_AGGREGATES
+    }
+
+
+def _users_payload(users: List[User]) -> Dict[str, Any]:
+    """Build the users resource payload"""
+    return {
+        "users": users,
+        "total_users": len(users),
+        **_ARCH_DOMAIN_ENTITIES
+    }
+
+
+async def _prefetch_all() -> Tuple[List[Pizza], List[Order], List[User]]:
+    """Fetch the menu, recent orders and active users concurrently"""
+    return await asyncio.gather(
+        container.get_pizza_repository().get_available_pizzas(),
+        container.get_order_repository().get_recent_orders(50),  # Last 50 orders
+        container.get_user_repository().get_all_active()
+    )
+
+
+def _resource_result(payload: Dict[str, Any]) -> ReadResourceResult:
+    """Wrap a resource payload as JSON text"""
+    return ReadResourceResult(
+        contents=[
+            TextContent(
+                type="text",
+                text=_dump(payload)
             )
         ]
     )
@@ -70,234 +222,364 @@ async def read_resource(uri: str) -> ReadResourceResult:
         # Get menu from clean architecture
         pizza_repo = container.get_pizza_repository()
         pizzas = await pizza_repo.get_available_pizzas()
-        
-        menu_data = []
-        for pizza in pizzas:
-            menu_data.append({
-                "id": pizza.id,
-                "name": pizza.display_name,
-                "price": pizza.formatted_price,
-                "category": pizza.category.value,
-                "description": pizza.description,
-                "ingredients": pizza.ingredients,
-                "available": pizza.is_available
-            })
-        
-        return ReadResourceResult(
-            contents=[
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "menu": menu_data,
-                        "categories": ["all", "veg", "non-veg"],
-                        "total_items": len(menu_data),
-                        "architecture": "Clean Architecture with Domain Entities"
-                    }, indent=2)
-                )
-            ]
-        )
+        return _resource_result(_menu_payload(pizzas))
     
     elif uri == "memory://orders":
         # Get orders from clean architecture
         order_repo = container.get_order_repository()
         orders = await order_repo.get_recent_orders(50)  # Last 50 orders
-        
-        orders_data = []
-        for order in orders:
-            orders_data.append({
-                "order_id": order.id,
-                "customer_email": order.customer.email,
-                "customer_name": order.customer.name,
-                "status": order.status.value,
-                "total_amount": order.formatted_total,
-                "items_count": order.total_items,
-                "created_at": order.created_at.isoformat(),
-                "estimated_eta": order.estimated_eta
-            })
-        
-        return ReadResourceResult(
-            contents=[
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "orders": orders_data,
-                        "total_orders": len(orders_data),
-                        "architecture": "Clean Architecture with Domain Aggregates"
-                    }, indent=2)
-                )
-            ]
-        )
+        return _resource_result(_orders_payload(orders))
     
     elif uri == "memory://users":
         # Get users from clean architecture
         user_repo = container.get_user_repository()
         users = await user_repo.get_all_active()
-        
-        users_data = []
-        for user in users:
-            users_data.append({
-                "id": user.id,
-                "email": user.email,
-                "name": user.display_name,
-                "total_orders": user.total_orders,
-                "is_frequent_customer": user.is_frequent_customer,
-                "created_at": user.created_at.isoformat()
-            })
-        
-        return ReadResourceResult(
-            contents=[
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "users": users_data,
-                        "total_users": len(users_data),
-                        "architecture": "Clean Architecture with Domain Entities"
-                    }, indent=2)
-                )
-            ]
-        )
+        return _resource_result(_users_payload(users))
+    
+    elif uri == "memory://all":
+        # Independent collections, so fetch them in parallel
+        pizzas, orders, users = await _prefetch_all()
+        return _resource_result({
+            **_menu_payload(pizzas),
+            **_orders_payload(orders),
+            **_users_payload(users),
+            **_ARCH_AGGREGATED_RESOURCES
+        })
     
     else:
         raise ValueError(f"Unknown resource: {uri}")
 
 
 # --- TOOLS ---
-@server.list_tools()
-async def list_tools() -> ListToolsResult:
-    """List available tools using clean architecture"""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="get_menu",
-                description="Get the pizza menu using clean architecture, optionally filtered by category",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "category": {
-                            "type": "string",
-                            "enum": ["all", "veg", "non-veg"],
-                            "description": "Filter menu by category (default: all)"
-                        }
+# Tool definitions are static, so they are built once at import
+_TOOLS_RESULT = ListToolsResult(
+    tools=[
+        Tool(
+            name="get_menu",
+            description="Get the pizza menu using clean architecture, optionally filtered by category",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "category": {
+                        "type": "string",
+                        "enum": ["all", "veg", "non-veg"],
+                        "description": "Filter menu by category (default: all)"
                     }
                 }
-            ),
-            Tool(
-                name="find_pizza",
-                description="Find a specific pizza using domain entities and search capabilities",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "name": {
-                            "type": "string",
-                            "description": "Pizza name to search for"
-                        },
-                        "size": {
-                            "type": "string",
-                            "description": "Pizza size preference (optional)"
-                        }
+            }
+        ),
+        Tool(
+            name="find_pizza",
+            description="Find a specific pizza using domain entities and search capabilities",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Pizza name to search for"
                     },
-                    "required": ["name"]
-                }
-            ),
-            Tool(
-                name="place_order",
-                description="Place a pizza order using clean architecture use cases",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "customer_name": {
-                            "type": "string",
-                            "description": "Customer full name"
-                        },
-                        "customer_email": {
-                            "type": "string",
-                            "description": "Customer email address"
-                        },
-                        "customer_phone": {
-                            "type": "string",
-                            "description": "Customer phone number",
-                            "default": "555-0123"
-                        },
-                        "customer_address": {
-                            "type": "string",
-                            "description": "Delivery address",
-                            "default": "123 Main Street"
-                        },
-                        "items": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of pizza names to order"
-                        }
+                    "size": {
+                        "type": "string",
+                        "description": "Pizza size preference (optional)"
+                    }
+                },
+                "required": ["name"]
+            }
+        ),
+        Tool(
+            name="place_order",
+            description="Place a pizza order using clean architecture use cases",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_name": {
+                        "type": "string",
+                        "description": "Customer full name"
                     },
-                    "required": ["customer_name", "customer_email", "items"]
-                }
-            ),
-            Tool(
-                name="track_order",
-                description="Track an existing order using clean architecture",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "order_id": {
-                            "type": "string",
-                            "description": "Order ID to track (optional)"
-                        },
-                        "customer_email": {
-                            "type": "string",
-                            "description": "Customer email to find recent orders (optional)"
-                        }
+                    "customer_email": {
+                        "type": "string",
+                        "description": "Customer email address"
+                    },
+                    "customer_phone": {
+                        "type": "string",
+                        "description": "Customer phone number",
+                        "default": "555-0123"
+                    },
+                    "customer_address": {
+                        "type": "string",
+                        "description": "Delivery address",
+                        "default": "123 Main Street"
+                    },
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of pizza names to order"
                     }
-                }
-            ),
-            Tool(
-                name="check_user",
-                description="Check if a user exists using domain entities",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "email": {
-                            "type": "string",
-                            "description": "User email address"
-                        }
+                },
+                "required": ["customer_name", "customer_email", "items"]
+            }
+        ),
+        Tool(
+            name="track_order",
+            description="Track an existing order using clean architecture",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "order_id": {
+                        "type": "string",
+                        "description": "Order ID to track (optional)"
                     },
-                    "required": ["email"]
+                    "customer_email": {
+                        "type": "string",
+                        "description": "Customer email to find recent orders (optional)"
+                    }
                 }
-            ),
-            Tool(
-                name="save_user",
-                description="Save or update user information using clean architecture",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "email": {
-                            "type": "string",
-                            "description": "User email address"
-                        },
-                        "name": {
-                            "type": "string",
-                            "description": "User full name"
-                        }
+            }
+        ),
+        Tool(
+            name="check_user",
+            description="Check if a user exists using domain entities",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "email": {
+                        "type": "string",
+                        "description": "User email address"
+                    }
+                },
+                "required": ["email"]
+            }
+        ),
+        Tool(
+            name="save_user",
+            description="Save or update user information using clean architecture",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "email": {
+                        "type": "string",
+                        "description": "User email address"
                     },
-                    "required": ["email", "name"]
-                }
-            ),
-            Tool(
-                name="get_suggestions",
-                description="Get pizza suggestions using domain logic and customer preferences",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "customer_email": {
-                            "type": "string",
-                            "description": "Customer email for personalized suggestions (optional)"
-                        },
-                        "preferences": {
-                            "type": "string",
-                            "description": "User preferences (e.g., 'vegetarian', 'spicy', 'popular')",
-                            "default": "popular"
-                        }
+                    "name": {
+                        "type": "string",
+                        "description": "User full name"
+                    }
+                },
+                "required": ["email", "name"]
+            }
+        ),
+        Tool(
+            name="get_suggestions",
+            description="Get pizza suggestions using domain logic and customer preferences",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_email": {
+                        "type": "string",
+                        "description": "Customer email for personalized suggestions (optional)"
+                    },
+                    "preferences": {
+                        "type": "string",
+                        "description": "User preferences (e.g., 'vegetarian', 'spicy', 'popular')",
+                        "default": "popular"
                     }
                 }
+            }
+        )
+    ]
+)
+
+
+@server.list_tools()
+async def list_tools() -> ListToolsResult:
+    """List available tools using clean architecture"""
+    return _TOOLS_RESULT
+
+
+# Serialized get_menu results: category -> (use case result they were built from, JSON text).
+# The use case hands back the same result object until the menu changes.
+_menu_texts: Dict[str, Tuple[Dict[str, Any], str]] = {}
+_MENU_TEXT_LIMIT = 16
+
+
+async def _handle_get_menu(arguments: Dict[str, Any]) -> str:
+    """Get the menu, optionally filtered by category"""
+    order_use_cases = container.get_order_use_cases()
+    category = arguments.get("category", "all")
+    result = await order_use_cases.get_menu(category)
+    
+    cached = _menu_texts.get(category)
+    if cached and cached[0] is result:
+        return cached[1]
+    
+    text = _dump({
+        "success": result["success"],
+        "category": result["category"],
+        "items": result["items"],
+        "total_items": result["total_items"],
+        **_ARCH_USE_CASES
+    })
+    if category in _menu_texts or len(_menu_texts) < _MENU_TEXT_LIMIT:
+        _menu_texts[category] = (result, text)
+    return text
+
+
+async def _handle_find_pizza(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Find a pizza by name and size"""
+    order_use_cases = container.get_order_use_cases()
+    pizza_name = arguments["name"]
+    size = arguments.get("size", "large")
+    
+    result = await order_use_cases.find_pizza(pizza_name, size)
+    
+    return {
+        "success": result["success"],
+        "pizza": result.get("pizza"),
+        "error": result.get("error"),
+        **_ARCH_ENTITY_SEARCH
+    }
+
+
+# Caps how many orders are processed at once; extra calls wait instead of piling onto the repositories
+_PLACE_ORDER_SEM = asyncio.Semaphore(int(os.getenv("MCP_PLACE_ORDER_CONCURRENCY", "16")))
+
+
+async def _report_progress(message: str):
+    """Forward place_order progress to the client as an MCP log message"""
+    try:
+        await server.request_context.session.send_log_message(
+            level="info",
+            data=message,
+            logger="place_order"
+        )
+    except Exception:
+        # No active request (direct call) or the client has gone away; progress is best-effort
+        pass
+
+
+async def _handle_place_order(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Place an order"""
+    order_use_cases = container.get_order_use_cases()
+    
+    # Create order request using clean architecture models
+    order_request = OrderRequest(
+        customer_name=arguments["customer_name"],
+        customer_email=arguments["customer_email"],
+        customer_phone=arguments.get("customer_phone", "555-0123"),
+        customer_address=arguments.get("customer_address", "123 Main Street"),
+        items=arguments["items"]
+    )
+    
+    async with _PLACE_ORDER_SEM:
+        result = await order_use_cases.place_order(order_request, on_progress=_report_progress)
+    
+    return {
+        "success": result.success,
+        "order_id": result.order_id,
+        "message": result.message,
+        "order_details": result.order_details,
+        "error": result.error,
+        **_ARCH_ORDER_USE_CASES
+    }
+
+
+async def _handle_track_order(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Track an order by ID or customer email"""
+    order_use_cases = container.get_order_use_cases()
+    order_id = arguments.get("order_id")
+    customer_email = arguments.get("customer_email")
+    
+    result = await order_use_cases.track_order(order_id, customer_email)
+    
+    return {
+        "success": result.success,
+        "order_id": result.order_id,
+        "message": result.message,
+        "order_details": result.order_details,
+        "error": result.error,
+        **_ARCH_ORDER_AGGREGATE
+    }
+
+
+async def _handle_check_user(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Check whether a user exists"""
+    order_domain_service = container.get_order_domain_service()
+    email = arguments["email"]
+    
+    user, order_count = await order_domain_service.get_customer_with_order_count(email)
+    
+    return {
+        "exists": user is not None,
+        "user": {
+            "email": user.email,
+            "name": user.display_name,
+            "total_orders": user.total_orders,
+            "is_frequent_customer": user.is_frequent_customer
+        } if user else None,
+        "orders_count": order_count,
+        **_ARCH_USER_ENTITY
+    }
+
+
+async def _handle_save_user(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Save or update a user"""
+    user_repo = container.get_user_repository()
+    email = arguments["email"]
+    name = arguments["name"]
+    
+    # Creates the user or updates the existing one's name in a single repository call
+    saved_user, _ = await user_repo.upsert(email, name)
+    
+    return {
+        "success": True,
+        "user": {
+            "email": saved_user.email,
+            "name": saved_user.display_name,
+            "is_new_customer": saved_user.is_new_customer
+        },
+        "message": "User saved successfully using domain entity",
+        **_ARCH_USER_REPOSITORY
+    }
+
+
+async def _handle_get_suggestions(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Get pizza suggestions for a customer"""
+    order_use_cases = container.get_order_use_cases()
+    customer_email = arguments.get("customer_email")
+    preferences = arguments.get("preferences", "popular")
+    
+    result = await order_use_cases.get_suggestions(customer_email, preferences)
+    
+    return {
+        "success": result["success"],
+        "message": result["message"],
+        "suggestions": result["suggestions"],
+        "preferences": preferences,
+        **_ARCH_DOMAIN_SERVICE
+    }
+
+
+# Tool name -> handler returning the JSON payload (or its serialized text) for the tool result
+ToolPayload = Union[Dict[str, Any], str]
+
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[ToolPayload]]] = {
+    "get_menu": _handle_get_menu,
+    "find_pizza": _handle_find_pizza,
+    "place_order": _handle_place_order,
+    "track_order": _handle_track_order,
+    "check_user": _handle_check_user,
+    "save_user": _handle_save_user,
+    "get_suggestions": _handle_get_suggestions,
+}
+
+
+def _wrap(payload: ToolPayload) -> CallToolResult:
+    """Wrap a tool payload as JSON text"""
+    return CallToolResult(
+        content=[
+            TextContent(
+                type="text",
+                text=payload if isinstance(payload, str) else _dump(payload)
             )
         ]
     )
@@ -306,215 +588,23 @@ async def list_tools() -> ListToolsResult:
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Handle tool calls using clean architecture use cases"""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _wrap({
+            "error": f"Unknown tool: {name}",
+            "available_tools": list(_HANDLERS)
+        })
     
     try:
-        if name == "get_menu":
-            order_use_cases = container.get_order_use_cases()
-            category = arguments.get("category", "all")
-            result = await order_use_cases.get_menu(category)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "success": result["success"],
-                            "category": result["category"],
-                            "items": result["items"],
-                            "total_items": result["total_items"],
-                            "architecture": "Clean Architecture - Application Use Cases"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        elif name == "find_pizza":
-            order_use_cases = container.get_order_use_cases()
-            pizza_name = arguments["name"]
-            size = arguments.get("size", "large")
-            
-            result = await order_use_cases.find_pizza(pizza_name, size)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "success": result["success"],
-                            "pizza": result.get("pizza"),
-                            "error": result.get("error"),
-                            "architecture": "Clean Architecture - Domain Entity Search"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        elif name == "place_order":
-            order_use_cases = container.get_order_use_cases()
-            
-            # Create order request using clean architecture models
-            order_request = OrderRequest(
-                customer_name=arguments["customer_name"],
-                customer_email=arguments["customer_email"],
-                customer_phone=arguments.get("customer_phone", "555-0123"),
-                customer_address=arguments.get("customer_address", "123 Main Street"),
-                items=arguments["items"]
-            )
-            
-            result = await order_use_cases.place_order(order_request)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "success": result.success,
-                            "order_id": result.order_id,
-                            "message": result.message,
-                            "order_details": result.order_details,
-                            "error": result.error,
-                            "architecture": "Clean Architecture - Domain Aggregates & Use Cases"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        elif name == "track_order":
-            order_use_cases = container.get_order_use_cases()
-            order_id = arguments.get("order_id")
-            customer_email = arguments.get("customer_email")
-            
-            result = await order_use_cases.track_order(order_id, customer_email)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "success": result.success,
-                            "order_id": result.order_id,
-                            "message": result.message,
-                            "order_details": result.order_details,
-                            "error": result.error,
-                            "architecture": "Clean Architecture - Order Aggregate"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        elif name == "check_user":
-            user_repo = container.get_user_repository()
-            email = arguments["email"]
-            
-            user = await user_repo.get_by_email(email)
-            order_count = await user_repo.get_customer_order_count(email) if user else 0
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "exists": user is not None,
-                            "user": {
-                                "email": user.email,
-                                "name": user.display_name,
-                                "total_orders": user.total_orders,
-                                "is_frequent_customer": user.is_frequent_customer
-                            } if user else None,
-                            "orders_count": order_count,
-                            "architecture": "Clean Architecture - User Entity"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        elif name == "save_user":
-            user_repo = container.get_user_repository()
-            email = arguments["email"]
-            name = arguments["name"]
-            
-            # Check if user exists
-            existing_user = await user_repo.get_by_email(email)
-            
-            if existing_user:
-                # Update existing user
-                existing_user.update_profile(name=name)
-                saved_user = await user_repo.save(existing_user)
-            else:
-                # Create new user using domain entity
-                from ...domain.entities import User
-                new_user = User(email=email, name=name)
-                saved_user = await user_repo.save(new_user)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "success": True,
-                            "user": {
-                                "email": saved_user.email,
-                                "name": saved_user.display_name,
-                                "is_new_customer": saved_user.is_new_customer
-                            },
-                            "message": "User saved successfully using domain entity",
-                            "architecture": "Clean Architecture - User Entity & Repository"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        elif name == "get_suggestions":
-            order_use_cases = container.get_order_use_cases()
-            customer_email = arguments.get("customer_email")
-            preferences = arguments.get("preferences", "popular")
-            
-            result = await order_use_cases.get_suggestions(customer_email, preferences)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "success": result["success"],
-                            "message": result["message"],
-                            "suggestions": result["suggestions"],
-                            "preferences": preferences,
-                            "architecture": "Clean Architecture - Domain Service Logic"
-                        }, indent=2)
-                    )
-                ]
-            )
-        
-        else:
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "error": f"Unknown tool: {name}",
-                            "available_tools": [
-                                "get_menu", "find_pizza", "place_order", 
-                                "track_order", "check_user", "save_user", "get_suggestions"
-                            ]
-                        }, indent=2)
-                    )
-                ]
-            )
-    
+        payload = await handler(arguments)
     except Exception as e:
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "error": f"Tool execution failed: {str(e)}",
-                        "tool": name,
-                        "architecture": "Clean Architecture - Error Handling"
-                    }, indent=2)
-                )
-            ]
-        )
+        payload = {
+            "error": f"Tool execution failed: {str(e)}",
+            "tool": name,
+            **_ARCH_ERROR_HANDLING
+        }
+    
+    return _wrap(payload)
 
 
 async def main():
@@ -529,9 +619,22 @@ async def main():
     print("🎯 Benefits: Testable, Maintainable, Framework-Independent")
     print("")
     
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await container.get_llm_service().aclose()
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Log to stderr: stdout carries the MCP stdio protocol
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    # uvloop is a faster drop-in event loop; it has no Windows build, so fall back to asyncio
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main()) 
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+BatchingLLMService: merging identical calls, isolating failures, cancellation
+and forwarding to the wrapped service.
+"""
+
+import asyncio
+
+import pytest
+
+from src.application.interfaces import ILLMService
+from src.infrastructure.external.batching_llm_service import BatchingLLMService
+
+
+class _RecordingLLMService(ILLMService):
+    """LLM stub that records prompts and can fail or stall on demand"""
+    
+    def __init__(self, delay: float = 0.0):
+        self.prompts = []
+        self.delay = delay
+        self.closed = False
+    
+    async def parse_user_intent(self, message, context=None):
+        return {"intent": "general_chat", "parameters": {}, "confidence": 1.0}
+    
+    async def generate_response(self, prompt, context=None):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delay)
+        if prompt == "fail":
+            raise RuntimeError("upstream error")
+        return f"reply to {prompt}"
+    
+    async def generate_order_confirmation_message(self, order):
+        return ""
+    
+    async def generate_tracking_message(self, order):
+        return ""
+    
+    async def generate_suggestions_message(self, pizzas, preferences):
+        return ""
+    
+    async def generate_welcome_message(self, user_name=None, is_new_user=False):
+        return ""
+    
+    async def generate_error_message(self, error, context=None):
+        return ""
+    
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_upstream_call():
+    inner = _RecordingLLMService()
+    service = BatchingLLMService(inner)
+    
+    results = await asyncio.gather(*(service.generate_response("menu") for _ in range(5)))
+    
+    assert results == ["reply to menu"] * 5
+    assert inner.prompts == ["menu"]
+
+
+@pytest.mark.asyncio
+async def test_failure_does_not_leak_into_other_calls():
+    inner = _RecordingLLMService()
+    service = BatchingLLMService(inner)
+    
+    results = await asyncio.gather(
+        service.generate_response("menu"),
+        service.generate_response("fail"),
+        service.generate_response("order"),
+        return_exceptions=True
+    )
+    
+    assert results[0] == "reply to menu"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == "reply to order"
+    assert sorted(inner.prompts) == ["fail", "menu", "order"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_joined_caller():
+    inner = _RecordingLLMService(delay=0.05)
+    service = BatchingLLMService(inner)
+    
+    first = asyncio.ensure_future(service.generate_response("menu"))
+    second = asyncio.ensure_future(service.generate_response("menu"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    
+    assert await second == "reply to menu"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_its_callers():
+    inner = _RecordingLLMService(delay=10)
+    service = BatchingLLMService(inner)
+    
+    caller = asyncio.ensure_future(service.generate_response("menu"))
+    await asyncio.sleep(0.02)
+    for batch in list(service._batches):
+        batch.cancel()
+    
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(caller, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_aclose_is_forwarded():
+    inner = _RecordingLLMService()
+    
+    await BatchingLLMService(inner).aclose()
+    
+    assert inner.closed
@@ -0,0 +1,85 @@
+"""
+InMemoryOrderRepository: the status, email and creation-time indexes stay
+consistent through saves, status updates and deletes.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from src.domain.data.menu_data import get_default_menu
+from src.domain.entities import Order, OrderItem, OrderStatus, CustomerInfo
+from src.infrastructure.persistence.in_memory_repositories import InMemoryOrderRepository
+
+_START = datetime(2026, 1, 1, 12, 0)
+
+
+def _order(minutes: int, email: str = "ana@example.com") -> Order:
+    """Order created ``minutes`` after the start time"""
+    return Order(
+        customer=CustomerInfo(name="Ana", email=email, phone="5551234567", address="1 Main St"),
+        items=[OrderItem(pizza=get_default_menu()[0])],
+        created_at=_START + timedelta(minutes=minutes)
+    )
+
+
+@pytest_asyncio.fixture
+async def repo_with_orders():
+    repo = InMemoryOrderRepository()
+    orders = [await repo.save(_order(minutes)) for minutes in (20, 0, 10)]
+    return repo, orders
+
+
+@pytest.mark.asyncio
+async def test_status_update_moves_order_between_indexes(repo_with_orders):
+    repo, (order, *_) = repo_with_orders
+    
+    assert await repo.update_status(order.id, OrderStatus.CANCELLED)
+    
+    assert order not in await repo.get_by_status(OrderStatus.PENDING)
+    assert order in await repo.get_by_status(OrderStatus.CANCELLED)
+    assert order not in await repo.get_active_orders()
+    assert len(await repo.get_active_orders()) == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_order_from_every_index(repo_with_orders):
+    repo, (newest, oldest, middle) = repo_with_orders
+    
+    assert await repo.delete(middle.id)
+    
+    assert await repo.get_by_status(OrderStatus.PENDING) == [newest, oldest]
+    assert await repo.get_active_orders() == [newest, oldest]
+    assert await repo.get_by_customer_email("ANA@example.com") == [newest, oldest]
+    assert await repo.get_customer_order_count("ana@example.com") == 2
+    assert await repo.get_recent_orders() == [newest, oldest]
+    assert await repo.get_orders_by_date_range(_START, _START + timedelta(hours=1)) == [oldest, newest]
+    assert not await repo.delete(middle.id)
+
+
+@pytest.mark.asyncio
+async def test_resaving_with_new_email_and_time_reindexes(repo_with_orders):
+    repo, (newest, oldest, middle) = repo_with_orders
+    
+    oldest.customer = CustomerInfo(name="Bea", email="bea@example.com", phone="5551234567", address="2 Main St")
+    oldest.created_at = _START + timedelta(minutes=30)
+    await repo.save(oldest)
+    
+    assert await repo.get_by_customer_email("ana@example.com") == [newest, middle]
+    assert await repo.get_by_customer_email("bea@example.com") == [oldest]
+    assert await repo.get_recent_orders(1) == [oldest]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit, expected", [
+    (2, ["newest", "middle"]),
+    (10, ["newest", "middle", "oldest"]),
+    (0, []),
+    (-1, ["newest", "middle"]),
+])
+async def test_recent_orders_slices_newest_first(repo_with_orders, limit, expected):
+    repo, (newest, oldest, middle) = repo_with_orders
+    names = {newest.id: "newest", middle.id: "middle", oldest.id: "oldest"}
+    
+    assert [names[order.id] for order in await repo.get_recent_orders(limit)] == expected
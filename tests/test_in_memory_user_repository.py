@@ -0,0 +1,51 @@
+"""
+InMemoryUserRepository: the email and ID indexes stay consistent when users
+take over emails, change them and are deleted.
+"""
+
+import pytest
+
+from src.domain.entities import User
+from src.infrastructure.persistence.in_memory_repositories import InMemoryUserRepository
+
+
+@pytest.mark.asyncio
+async def test_new_user_with_existing_email_evicts_the_first():
+    repo = InMemoryUserRepository()
+    first = await repo.save(User(email="ana@example.com", name="Ana"))
+    second = await repo.save(User(email="ANA@example.com", name="Ana Two"))
+    
+    assert await repo.get_by_email("ana@example.com") is second
+    assert await repo.get_by_id(second.id) is second
+    assert await repo.get_by_id(first.id) is None
+
+
+@pytest.mark.asyncio
+async def test_email_change_frees_the_old_key():
+    repo = InMemoryUserRepository()
+    user = await repo.save(User(email="old@example.com", name="Ana"))
+    
+    user.email = "new@example.com"
+    await repo.save(user)
+    
+    assert await repo.get_by_email("old@example.com") is None
+    assert not await repo.exists_by_email("old@example.com")
+    assert await repo.get_by_email("new@example.com") is user
+    
+    other = await repo.save(User(email="old@example.com", name="Bea"))
+    assert await repo.get_by_id(user.id) is user
+    assert await repo.get_by_id(other.id) is other
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_displaced_user_keeps_the_new_owner():
+    repo = InMemoryUserRepository()
+    first = await repo.save(User(email="ana@example.com", name="Ana"))
+    second = await repo.save(User(email="ana@example.com", name="Ana Two"))
+    
+    assert not await repo.delete(first.id)
+    assert await repo.get_by_email("ana@example.com") is second
+    
+    assert await repo.delete(second.id)
+    assert await repo.get_by_email("ana@example.com") is None
+    assert await repo.get_by_id(second.id) is None
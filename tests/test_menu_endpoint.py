@@ -0,0 +1,46 @@
+"""
+/menu responses: tagged JSON bodies for menus, a plain 200 body for failures.
+"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from src.infrastructure.web.fastapi_app import app
+
+
+class _MenuUseCases:
+    """Order use cases stub returning a fixed menu result"""
+    
+    def __init__(self, result):
+        self.result = result
+    
+    async def get_menu(self, category="all"):
+        return self.result
+
+
+def test_failed_menu_is_reported_in_a_200_body(monkeypatch):
+    use_cases = _MenuUseCases({"success": False, "error": "menu store down"})
+    monkeypatch.setattr(app.state, "order_use_cases", use_cases, raising=False)
+    
+    response = TestClient(app).get("/menu", params={"category": "veg"})
+    
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.json() == {"success": False, "category": "veg", "items": [], "total_items": 0}
+
+
+def test_menu_is_tagged_and_revalidated(monkeypatch):
+    use_cases = _MenuUseCases({"success": True, "category": "all", "items": [], "total_items": 0})
+    monkeypatch.setattr(app.state, "order_use_cases", use_cases, raising=False)
+    client = TestClient(app)
+    
+    response = client.get("/menu")
+    etag = response.headers["etag"]
+    
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    assert client.get("/menu", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,60 @@
+"""
+Pizza name resolution in OrderUseCases: exact names, then name search, with
+legacy menu aliases only for names nothing else matched.
+"""
+
+import pytest
+
+from src.application.use_cases.order_use_cases import OrderUseCases
+from src.infrastructure.persistence.in_memory_repositories import (
+    InMemoryPizzaRepository,
+    InMemoryOrderRepository,
+    InMemoryUserRepository
+)
+
+
+@pytest.fixture
+def order_use_cases():
+    return OrderUseCases(
+        order_repo=InMemoryOrderRepository(),
+        pizza_repo=InMemoryPizzaRepository(),
+        user_repo=InMemoryUserRepository(),
+        llm_service=None
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, expected", [
+    # Substring search hits win over the legacy aliases for these phrases
+    ("classic", "Pepperoni Classic"),
+    ("supreme", "Veggie Supreme"),
+    ("chicken", "BBQ Chicken"),
+    # Exact names
+    ("Chicken Supreme", "Chicken Supreme"),
+    ("margherita", "Margherita"),
+    # Aliases that no name or ingredient matches
+    ("fungi", "Mushroom Delight"),
+    ("carnivore", "Meat Lovers"),
+])
+async def test_find_pizza_resolves_name(order_use_cases, name, expected):
+    result = await order_use_cases.find_pizza(name)
+    
+    assert result["success"]
+    assert result["pizza"]["name"].startswith(expected)
+
+
+@pytest.mark.asyncio
+async def test_aliases_for_deleted_pizzas_are_dropped():
+    repo = InMemoryPizzaRepository()
+    
+    assert [pizza.name for pizza in await repo.get_by_alias("FUNGI")] == ["Mushroom Delight"]
+    await repo.delete("pizza_4")
+    assert await repo.get_by_alias("fungi") == []
+
+
+@pytest.mark.asyncio
+async def test_get_by_name_ignores_aliases():
+    repo = InMemoryPizzaRepository()
+    
+    assert await repo.get_by_name("classic") == []
+    assert await repo.get_by_name("fungi") == []
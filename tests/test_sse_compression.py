@@ -0,0 +1,59 @@
+"""
+Server-sent event routes must reach the client uncompressed, even though
+larger JSON responses go through GZipMiddleware.
+"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from src.application.interfaces import ILLMService
+from src.infrastructure.web.fastapi_app import app
+
+# Long enough to pass the middleware's minimum_size
+_WELCOME_CHUNK = "Welcome to Pizza AI! " * 64
+
+
+class _StreamingLLMService(ILLMService):
+    """LLM stub whose welcome stream yields a few large chunks"""
+    
+    async def parse_user_intent(self, message, context=None):
+        return {"intent": "general_chat", "parameters": {}, "confidence": 1.0}
+    
+    async def generate_response(self, prompt, context=None):
+        return ""
+    
+    async def generate_order_confirmation_message(self, order):
+        return ""
+    
+    async def generate_tracking_message(self, order):
+        return ""
+    
+    async def generate_suggestions_message(self, pizzas, preferences):
+        return ""
+    
+    async def generate_welcome_message(self, user_name=None, is_new_user=False):
+        return ""
+    
+    async def generate_error_message(self, error, context=None):
+        return ""
+    
+    async def stream_welcome_message(self, user_name=None, is_new_user=False):
+        for _ in range(3):
+            yield _WELCOME_CHUNK
+
+
+def test_welcome_stream_is_not_gzipped(monkeypatch):
+    monkeypatch.setattr(app.state, "llm_service", _StreamingLLMService(), raising=False)
+    client = TestClient(app)
+    
+    response = client.get("/welcome/stream", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response.headers
+    assert response.text.count("data: ") == 4
+    assert response.text.endswith("event: done\ndata: {}\n\n")